@@ -50,7 +50,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from scripts.collection.tiktok_scraper import download_single_video as download_tiktok_video
-from scripts.collection.tiktok_scraper import load_whisper_model, get_memory_usage
+from scripts.collection.tiktok_scraper import load_whisper_model, get_memory_usage, COMPUTE_TYPE_CHOICES
 from scripts.utils.memory_efficient_append import append_batch_to_master_json_efficient as append_to_master_json
 
 def append_batch_to_master_json(metadata_list, master_file_path):
@@ -1237,7 +1237,9 @@ class WorkerProcessor:
         self.whisper_device = "CPU"
         if args.whisper:
             from scripts.collection.tiktok_scraper import load_whisper_model
-            self.whisper_model, self.whisper_device = load_whisper_model(force_cpu=args.force_cpu)
+            self.whisper_model, self.whisper_device = load_whisper_model(
+                force_cpu=args.force_cpu, compute_type=getattr(args, 'compute_type', None),
+                num_workers=args.workers)
             if self.whisper_model:
                 self.update_worker_status('ready', f'Whisper model loaded on {self.whisper_device}')
             else:
@@ -1785,6 +1787,8 @@ async def main():
     parser.add_argument("--mp3", action="store_true", help="Download audio only as MP3 instead of video")
     parser.add_argument("--whisper", action="store_true", help="Use faster-whisper for additional transcription")
     parser.add_argument("--force-cpu", action="store_true", help="Force CPU mode for whisper")
+    parser.add_argument("--compute-type", choices=COMPUTE_TYPE_CHOICES,
+                       help="Whisper compute type (default: int8_float16 on GPU, int8 on CPU)")
     
     # Comment options
     parser.add_argument("--max-comments", type=int, default=10, help="Maximum comments to extract per video (default: 10)")
@@ -1823,7 +1827,7 @@ async def main():
             arg in ['--workers', '--diagnose', '--memory-tracking', '--force-cpu', 
                    '--clean-progress', '--clean-old-downloads', '--whisper', '--mp3',
                    '--delay', '--batch-size', '--max-comments', '--quality', '--output',
-                   '--proxy', '--limit', '--force-redownload'] or 
+                   '--proxy', '--limit', '--force-redownload', '--compute-type'] or 
             arg.isdigit() or arg.startswith('-') == False
             for arg in sys.argv[1:]
         )
@@ -1877,7 +1881,8 @@ async def main():
     whisper_device = "CPU"
     if args.whisper:
         print("🎤 Loading faster-whisper model...")
-        whisper_model, whisper_device = load_whisper_model(force_cpu=args.force_cpu)
+        whisper_model, whisper_device = load_whisper_model(force_cpu=args.force_cpu,
+                                                           compute_type=args.compute_type)
         if not whisper_model:
             print("❌ Failed to load whisper model")
             sys.exit(1)
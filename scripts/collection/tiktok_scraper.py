@@ -5,34 +5,73 @@ import os
 import sys
 import json
 import argparse
+import asyncio
+import atexit
+import functools
 import re
 import platform
 import gc
+import importlib
+import importlib.util
 import time
-import psutil
 import signal
 import threading
+import queue
+import _thread
 import multiprocessing as mp
 from pathlib import Path
 from datetime import datetime
 import shutil
 import site
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import subprocess
+from contextlib import contextmanager
+from types import SimpleNamespace
 
 try:
-    import yt_dlp
+    import fcntl  # Unix file locking
 except ImportError:
-    print("Error: yt-dlp is not installed.")
-    print("Install it with: pip install yt-dlp")
-    sys.exit(1)
-
-# Try to import faster-whisper
+    fcntl = None
 try:
-    from faster_whisper import WhisperModel
-    WHISPER_AVAILABLE = True
+    import msvcrt  # Windows file locking
 except ImportError:
-    WHISPER_AVAILABLE = False
+    msvcrt = None
+
+# Repo root, so the shared helpers in scripts/utils import when run as a script
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from scripts.utils.fast_json import dumps_json, dumps_json_line, dumps_json_pretty, loads_json
+from scripts.utils.memory_efficient_append import append_items_in_place, indent_items
+
+# Heavy dependencies (yt_dlp, psutil, faster_whisper) are imported on first
+# use so that worker processes and --help don't pay their import cost
+YT_DLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+_lazy_modules = {}
+
+
+def lazy_import(name):
+    """Import a module on first use and cache it"""
+    module = _lazy_modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+        _lazy_modules[name] = module
+    return module
+
+
+WHISPER_BATCH_SIZE = 8
+
+# Platform facts and filename patterns are fixed for the life of the process
+_PLATFORM = platform.system()
+_IS_WINDOWS = _PLATFORM == 'Windows'
+_DOWNLOADED_WITH = f"Robust TikTok Scraper v3.0 ({_PLATFORM})"
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]' if _IS_WINDOWS else r'[/]')
+_WS_RE = re.compile(r'\s+')
+_MAX_FILENAME_LEN = 200 if _IS_WINDOWS else 255
 
 # Global variables for graceful shutdown
 shutdown_requested = False
@@ -54,6 +93,7 @@ def signal_handler(signum, frame):
 #     signal.signal(signal.SIGTERM, signal_handler)
 
 
+@functools.lru_cache(maxsize=1)
 def get_platform_info():
     """Get platform-specific information"""
     system = platform.system().lower()
@@ -140,41 +180,148 @@ def setup_cuda_paths():
     return cuda_paths
 
 
-def load_whisper_model(force_cpu=False):
-    """Load faster-whisper model for transcription"""
+GPU_COMPUTE_TYPES = ["int8_float16", "float16", "auto"]
+CPU_COMPUTE_TYPES = ["int8"]
+ARM_CPU_COMPUTE_TYPES = ["int8", "auto"]
+COMPUTE_TYPE_CHOICES = ["auto", "int8", "int8_float16", "int8_float32", "float16", "float32"]
+
+
+def get_compute_type_order(device, compute_type=None):
+    """Get the compute types to try for a device, fastest first.
+
+    An explicit compute_type (or the WHISPER_COMPUTE_TYPE env var) is tried
+    first, then the device defaults follow as fallbacks.
+    """
+    if device == "cuda":
+        order = list(GPU_COMPUTE_TYPES)
+    elif platform.machine().lower() in ('arm64', 'aarch64'):
+        order = list(ARM_CPU_COMPUTE_TYPES)
+    else:
+        order = list(CPU_COMPUTE_TYPES)
+
+    requested = compute_type or os.environ.get('WHISPER_COMPUTE_TYPE')
+    if requested:
+        order = [requested] + [ct for ct in order if ct != requested]
+    return order
+
+
+def get_cpu_threads(num_workers=1):
+    """Split the CPU cores between worker processes so BLAS threads don't oversubscribe"""
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+def _load_model_with_fallback(device, compute_type=None, **model_kwargs):
+    """Try each compute type in order, skipping ones the device doesn't support"""
+    order = get_compute_type_order(device, compute_type)
+    for i, ct in enumerate(order):
+        try:
+            model = lazy_import("faster_whisper").WhisperModel("small.en", device=device, compute_type=ct,
+                                                               **model_kwargs)
+            return model, ct
+        except ValueError as e:
+            # CTranslate2 raises ValueError for unsupported compute types
+            if i == len(order) - 1:
+                raise
+            print(f"⚠️  compute_type={ct} not supported on {device}: {e}")
+
+
+def load_whisper_model(force_cpu=False, compute_type=None, num_workers=1):
+    """Load faster-whisper model for transcription.
+
+    num_workers is the number of processes that will each load a model; CPU
+    inference threads are divided between them.
+    """
     if not WHISPER_AVAILABLE:
         print("❌ faster-whisper not available. Install with: pip install faster-whisper")
         return None, None
     
+    # Passed to the model as cpu_threads, which sizes CTranslate2's thread pool
+    # even when ctranslate2 was already imported (e.g. by the forkserver)
+    cpu_threads = get_cpu_threads(num_workers)
+
     try:
         if not force_cpu:
             cuda_paths = setup_cuda_paths()
             if cuda_paths:
                 print(f"✅ CUDA paths configured: {len(cuda_paths)} paths found")
-            
+
             try:
                 print("🚀 Loading GPU whisper model...")
-                model = WhisperModel("small.en", device="cuda", compute_type="float16")
-                print("✅ GPU model loaded!")
+                model, ct = _load_model_with_fallback("cuda", compute_type)
+                print(f"✅ GPU model loaded! (compute_type={ct})")
                 return model, "GPU"
             except Exception as e:
                 print(f"⚠️  GPU failed: {e}")
                 print("🔄 Falling back to CPU model...")
-        
-        model = WhisperModel("small.en", device="cpu", compute_type="int8")
-        print("✅ CPU model loaded!")
+
+        model, ct = _load_model_with_fallback("cpu", compute_type, cpu_threads=cpu_threads, num_workers=1)
+        print(f"✅ CPU model loaded! (compute_type={ct}, cpu_threads={cpu_threads})")
         return model, "CPU"
-        
+
     except Exception as e:
         print(f"❌ Failed to load whisper model: {e}")
         return None, None
 
 
+WHISPER_SAMPLE_RATE = 16000
+
+
+def decode_audio_ffmpeg(media_path, sampling_rate=WHISPER_SAMPLE_RATE):
+    """Decode a media file to mono float32 PCM with one ffmpeg pass.
+
+    Returns a numpy array, or None if ffmpeg is unavailable or decoding fails.
+    """
+    import numpy as np
+
+    cmd = [
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-threads', '0',
+        '-i', media_path, '-vn', '-ac', '1', '-ar', str(sampling_rate),
+        '-f', 'f32le', '-'
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  ffmpeg audio decode failed, letting faster-whisper decode: {e}")
+        return None
+    return np.frombuffer(proc.stdout, dtype=np.float32)
+
+
+_batched_pipelines = {}
+
+
+def get_batched_pipeline(whisper_model):
+    """Get (or create) the batched inference pipeline wrapping a model"""
+    key = id(whisper_model)
+    if key not in _batched_pipelines:
+        _batched_pipelines[key] = lazy_import("faster_whisper").BatchedInferencePipeline(model=whisper_model)
+    return _batched_pipelines[key]
+
+
 def transcribe_with_whisper(video_path, whisper_model, device_type):
     """Transcribe video file using faster-whisper"""
     try:
         print(f"🎤 Transcribing with faster-whisper ({device_type})...")
-        segments, info = whisper_model.transcribe(video_path, beam_size=1, language="en")
+        # Hand faster-whisper ready-made 16kHz PCM so it skips its own decode/resample
+        audio = decode_audio_ffmpeg(video_path)
+        if audio is None:
+            audio = video_path
+        transcribe_kwargs = dict(
+            beam_size=1,
+            language="en",
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500),
+            condition_on_previous_text=False,
+            without_timestamps=True,
+        )
+        # Silero VAD strips silent intros/outros before the encoder runs; we only
+        # join segment text, so timestamps and cross-segment conditioning are skipped
+        if device_type == "GPU" and hasattr(lazy_import("faster_whisper"), "BatchedInferencePipeline"):
+            # Decode the VAD chunks of a clip in batches instead of one by one
+            pipeline = get_batched_pipeline(whisper_model)
+            segments, info = pipeline.transcribe(audio, batch_size=WHISPER_BATCH_SIZE,
+                                                 **transcribe_kwargs)
+        else:
+            segments, info = whisper_model.transcribe(audio, **transcribe_kwargs)
         
         text_segments = []
         for segment in segments:
@@ -191,10 +338,26 @@ def transcribe_with_whisper(video_path, whisper_model, device_type):
 
 def get_memory_usage():
     """Get current memory usage in MB"""
+    psutil = lazy_import("psutil")
     process = psutil.Process()
     return process.memory_info().rss / 1024 / 1024
 
 
+_memory_sample = (float('-inf'), 0.0)
+
+
+def get_memory_usage_cached(max_age=5.0):
+    """get_memory_usage(), re-sampled at most once every max_age seconds"""
+    global _memory_sample
+    
+    sampled_at, value = _memory_sample
+    now = time.monotonic()
+    if now - sampled_at >= max_age:
+        value = get_memory_usage()
+        _memory_sample = (now, value)
+    return value
+
+
 def cleanup_memory():
     """Force garbage collection and memory cleanup"""
     gc.collect()
@@ -203,27 +366,19 @@ def cleanup_memory():
 
 def kill_browser_processes():
     """Kill only browser processes spawned by yt-dlp (our child processes)"""
-    current_pid = os.getpid()
-    our_children = set()
-    
+    psutil = lazy_import("psutil")
     try:
-        # Get all our direct children first
-        current_process = psutil.Process(current_pid)
-        for child in current_process.children(recursive=True):
-            our_children.add(child.pid)
+        # Our descendants are the only candidates, so there's no need to scan
+        # the whole process table
+        children = psutil.Process(os.getpid()).children(recursive=True)
         
-        # Only kill browser processes that are our descendants
-        for proc in psutil.process_iter(['pid', 'name', 'ppid']):
+        for child in children:
             try:
-                proc_info = proc.info
-                proc_name = proc_info['name'].lower()
+                proc_name = child.name().lower()
                 
-                # Check if it's a browser process AND one of our children
-                if (any(browser in proc_name for browser in ['chromium', 'chrome', 'firefox', 'edge']) and
-                    proc_info['pid'] in our_children):
-                    
-                    print(f"🧹 Cleaning up yt-dlp browser process: {proc_name} (PID: {proc_info['pid']})")
-                    proc.kill()
+                if any(browser in proc_name for browser in ['chromium', 'chrome', 'firefox', 'edge']):
+                    print(f"🧹 Cleaning up yt-dlp browser process: {proc_name} (PID: {child.pid})")
+                    child.kill()
                     
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
@@ -236,55 +391,63 @@ def kill_browser_processes():
 
 def sanitize_filename(filename):
     """Sanitize filename for filesystem compatibility"""
-    if platform.system() == 'Windows':
-        invalid_chars = r'[<>:"/\\|?*]'
-    else:
-        invalid_chars = r'[/]'
-    
-    filename = re.sub(invalid_chars, '_', filename)
-    filename = re.sub(r'\s+', ' ', filename).strip()
+    filename = _INVALID_CHARS_RE.sub('_', filename)
+    filename = _WS_RE.sub(' ', filename).strip()
     filename = filename.strip('.')
     
-    max_length = 200 if platform.system() == 'Windows' else 255
-    if len(filename) > max_length:
-        filename = filename[:max_length]
+    if len(filename) > _MAX_FILENAME_LEN:
+        filename = filename[:_MAX_FILENAME_LEN]
     
     return filename
 
 
+# (metadata key, yt-dlp info key, default) for the fields copied straight across.
+# Defaults must be immutable since they're shared between every metadata dict.
+_METADATA_FIELDS = (
+    ("title", 'title', 'Unknown'),
+    ("description", 'description', ''),
+    ("duration", 'duration', 0),
+    ("video_id", 'id', ''),
+    ("url", 'webpage_url', ''),
+    ("uploader", 'uploader', 'Unknown'),
+    ("uploader_id", 'uploader_id', ''),
+    ("uploader_url", 'uploader_url', ''),
+    ("view_count", 'view_count', 0),
+    ("like_count", 'like_count', 0),
+    ("comment_count", 'comment_count', 0),
+    ("repost_count", 'repost_count', 0),
+    ("hashtags", 'tags', None),
+    ("upload_date", 'upload_date', ''),
+    ("timestamp", 'timestamp', 0),
+    ("width", 'width', 0),
+    ("height", 'height', 0),
+    ("fps", 'fps', 0),
+    ("filesize", 'filesize', 0),
+    ("format", 'format', ''),
+)
+
+
 def extract_metadata_minimal(info_dict):
     """Extract minimal metadata to save memory"""
-    metadata = {
-        "title": info_dict.get('title', 'Unknown'),
-        "description": info_dict.get('description', ''),
-        "duration": info_dict.get('duration', 0),
-        "video_id": info_dict.get('id', ''),
-        "url": info_dict.get('webpage_url', ''),
-        "uploader": info_dict.get('uploader', 'Unknown'),
-        "uploader_id": info_dict.get('uploader_id', ''),
-        "uploader_url": info_dict.get('uploader_url', ''),
-        "view_count": info_dict.get('view_count', 0),
-        "like_count": info_dict.get('like_count', 0),
-        "comment_count": info_dict.get('comment_count', 0),
-        "repost_count": info_dict.get('repost_count', 0),
-        "hashtags": info_dict.get('tags', []),
-        "upload_date": info_dict.get('upload_date', ''),
-        "timestamp": info_dict.get('timestamp', 0),
-        "width": info_dict.get('width', 0),
-        "height": info_dict.get('height', 0),
-        "fps": info_dict.get('fps', 0),
-        "filesize": info_dict.get('filesize', 0),
-        "format": info_dict.get('format', ''),
-        "downloaded_at": datetime.now().isoformat(),
-        "downloaded_with": f"Robust TikTok Scraper v3.0 ({platform.system()})",
-        "platform": platform.system()
-    }
+    get = info_dict.get
+    metadata = {key: get(source, default) for key, source, default in _METADATA_FIELDS}
+    if 'tags' not in info_dict:
+        metadata["hashtags"] = []
+    metadata["downloaded_at"] = datetime.now().isoformat()
+    metadata["downloaded_with"] = _DOWNLOADED_WITH
+    metadata["platform"] = _PLATFORM
     return metadata
 
 
 def download_single_video(url, output_dir="downloads", quality="best", audio_only=False, 
-                         use_whisper=False, whisper_model=None, whisper_device="CPU", proxy=None):
-    """Download a single TikTok video with memory optimization"""
+                         use_whisper=False, whisper_model=None, whisper_device="CPU", proxy=None,
+                         cleanup=True):
+    """Download a single TikTok video with memory optimization.
+
+    cleanup=False skips the per-video gc and browser-process cleanup; the
+    threaded path sets it because kill_browser_processes() would also kill
+    the children of other in-flight downloads, and runs both once at the end.
+    """
     global shutdown_requested
     
     if shutdown_requested:
@@ -293,11 +456,13 @@ def download_single_video(url, output_dir="downloads", quality="best", audio_onl
     try:
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        # Memory-optimized yt-dlp options
-        temp_ydl_opts = {
+        # Memory-optimized yt-dlp options; one YoutubeDL instance handles both
+        # the metadata extraction and the download
+        ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'extract_flat': False,
+            'noplaylist': True,
             'writesubtitles': False,  # Skip to save memory
             'writeautomaticsub': False,
             'socket_timeout': 30,
@@ -308,28 +473,6 @@ def download_single_video(url, output_dir="downloads", quality="best", audio_onl
             'proxy': proxy
         }
         
-        # Extract info
-        with yt_dlp.YoutubeDL(temp_ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-        
-        metadata = extract_metadata_minimal(info)
-        
-        # Create output folder
-        folder_name = sanitize_filename(metadata['title'])[:100]
-        video_folder = Path(output_dir) / folder_name
-        video_folder.mkdir(parents=True, exist_ok=True)
-        
-        # Configure download options
-        ydl_opts = {
-            'outtmpl': str(video_folder / f"{folder_name}.%(ext)s"),
-            'noplaylist': True,
-            'writesubtitles': False,
-            'writeautomaticsub': False,
-            'socket_timeout': 30,
-            'retries': 1,
-            'http_headers': temp_ydl_opts['http_headers'],
-        }
-        
         if audio_only:
             ydl_opts['format'] = 'bestaudio/best'
             ydl_opts['postprocessors'] = [{
@@ -343,9 +486,24 @@ def download_single_video(url, output_dir="downloads", quality="best", audio_onl
         else:
             ydl_opts['format'] = quality
         
-        # Download
+        yt_dlp = lazy_import("yt_dlp")
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+            # Extract info once; the same info dict is reused for the download so
+            # TikTok's page isn't fetched a second time
+            info = ydl.extract_info(url, download=False)
+            
+            metadata = extract_metadata_minimal(info)
+            
+            # Create output folder; titles repeat a lot (e.g. "#fyp"), so the
+            # video id keeps concurrent downloads and --clean deletions apart
+            folder_name = sanitize_filename(metadata['title'])[:100]
+            video_folder = Path(output_dir) / (f"{folder_name}_{metadata['video_id']}"
+                                               if metadata['video_id'] else folder_name)
+            video_folder.mkdir(parents=True, exist_ok=True)
+            
+            # Download
+            ydl.params['outtmpl'] = {'default': str(video_folder / f"{folder_name}.%(ext)s")}
+            ydl.process_ie_result(info, download=True)
         
         # Whisper transcription if requested (works even with audio_only=True)
         if use_whisper and whisper_model:
@@ -372,12 +530,13 @@ def download_single_video(url, output_dir="downloads", quality="best", audio_onl
         
         # Save metadata
         metadata_file = video_folder / "metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(metadata_file, 'wb') as f:
+            f.write(dumps_json(metadata))
         
         # Cleanup
-        cleanup_memory()
-        kill_browser_processes()
+        if cleanup:
+            cleanup_memory()
+            kill_browser_processes()
         
         return {
             'success': True,
@@ -388,161 +547,560 @@ def download_single_video(url, output_dir="downloads", quality="best", audio_onl
         }
         
     except Exception as e:
-        cleanup_memory()
-        kill_browser_processes()
+        if cleanup:
+            cleanup_memory()
+            kill_browser_processes()
         return {'success': False, 'error': str(e), 'url': url}
 
 
-def mark_url_processed(file_path, url):
-    """Mark URL as processed by adding '-' prefix"""
+PROCESSED_FLUSH_EVERY = 50
+_processed_buffer = {}
+
+
+def get_processed_path(file_path):
+    """Path of the append-only journal of processed URLs for a URL file"""
+    return f"{file_path}.processed"
+
+
+def flush_processed_urls(file_path=None):
+    """Write buffered processed URLs to their journal(s) in one write each"""
+    paths = [file_path] if file_path else list(_processed_buffer)
+    for path in paths:
+        pending = _processed_buffer.pop(path, None)
+        if not pending:
+            continue
+        try:
+            with open(get_processed_path(path), 'a', encoding='utf-8') as f:
+                f.write('\n'.join(pending) + '\n')
+        except Exception as e:
+            print(f"❌ Failed to record processed URLs: {e}")
+            return False
+    return True
+
+
+def mark_url_processed(file_path, url, flush=False):
+    """Mark URL as processed by appending it to the URL file's journal.
+
+    Marks are buffered and written PROCESSED_FLUSH_EVERY at a time; callers
+    flush the remainder with flush_processed_urls() when a run finishes.
+    Pass flush=True once the video is in the master file, so a killed run
+    can't lose the mark and download (and record) it again.
+    """
+    pending = _processed_buffer.setdefault(file_path, [])
+    pending.append(url)
+    if flush or len(pending) >= PROCESSED_FLUSH_EVERY:
+        return flush_processed_urls(file_path)
+    return True
+
+
+# Don't lose buffered marks if the run is interrupted
+atexit.register(flush_processed_urls)
+
+
+def load_processed_journal(file_path):
+    """Load the set of URLs recorded in a URL file's processed journal"""
+    processed_path = get_processed_path(file_path)
+    if not os.path.exists(processed_path):
+        return set()
+    with open(processed_path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def compact_processed_urls(file_path):
+    """Fold the processed journal back into the URL file as '-' prefixed lines.
+
+    Run once at the end of a run: the URL file is rewritten a single time
+    (via a temp file + rename) and the journal is removed.
+    """
+    flush_processed_urls(file_path)
+    journal = load_processed_journal(file_path)
+    if not journal or not os.path.exists(file_path):
+        return
+    
+    tmp_path = f"{file_path}.tmp"
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for line in lines:
-                stripped = line.strip()
-                if stripped == url:
-                    f.write(f"-{line}")
+        with open(file_path, 'r', encoding='utf-8') as src, \
+             open(tmp_path, 'w', encoding='utf-8') as dst:
+            for line in src:
+                url = line.strip()
+                if url in journal:
+                    dst.write(f"-{url}\n")
                 else:
-                    f.write(line)
+                    dst.write(line)
+        os.replace(tmp_path, file_path)
+        os.remove(get_processed_path(file_path))
+        print(f"📝 Marked {len(journal)} processed URLs in {file_path}")
+    except Exception as e:
+        print(f"❌ Failed to compact processed URLs: {e}")
+
+
+def get_journal_path(master_file_path):
+    """Path of the JSONL journal that collects appends for a master JSON file"""
+    return f"{master_file_path}.jsonl"
+
+
+@contextmanager
+def file_lock(path):
+    """Open path for appending (and reading) and hold an exclusive OS-level lock on it.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows, so waiting is
+    done by the kernel instead of polling a sidecar lock file.
+    """
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            # Lock byte 0 as the shared mutex; appends still go to end of file
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield f
+        finally:
+            f.flush()
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def append_to_master_json(metadata, master_file_path):
+    """Thread-safe append of one record to the master JSONL journal.
+
+    Each call writes a single line instead of rewriting the whole master file;
+    compact_master() folds the journal back into the JSON array at end of run.
+    """
+    journal_path = get_journal_path(master_file_path)
+    
+    try:
+        with file_lock(journal_path) as f:
+            line = dumps_json_line(metadata)
+            # A writer killed mid-line leaves no trailing newline; start a
+            # fresh line so this record isn't glued onto the torn one
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
         
+        print(f"📎 Appended to {Path(journal_path).name}")
         return True
+        
     except Exception as e:
-        print(f"❌ Failed to mark URL as processed: {e}")
+        print(f"❌ Failed to append to master JSON: {e}")
         return False
 
 
-def append_to_master_json(metadata, master_file_path):
-    """Thread-safe append to master JSON file"""
+def _rewrite_master(master_path, new_records):
+    """Fallback for master files that aren't a JSON array: load, extend, rewrite"""
+    master_data = []
+    if master_path.exists():
+        try:
+            with open(master_path, 'rb') as f:
+                master_data = loads_json(f.read())
+            if not isinstance(master_data, list):
+                master_data = [master_data]
+        except json.JSONDecodeError:
+            master_data = []
+    
+    master_data.extend(new_records)
+    
+    with open(master_path, 'wb') as f:
+        f.write(dumps_json_pretty(master_data))
+
+
+def compact_master(master_file_path):
+    """Fold the JSONL journal into the master JSON array and remove the journal.
+
+    New records are written after the array's last item, replacing the
+    closing bracket, so only the new bytes are written and the existing
+    master is never parsed.
+    """
+    master_path = Path(master_file_path)
+    journal_path = Path(get_journal_path(master_file_path))
+    
+    if not journal_path.exists():
+        return 0
+    
     try:
-        master_path = Path(master_file_path)
+        new_records = []
+        bad_lines = []
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    new_records.append(loads_json(line))
+                except ValueError:
+                    # Torn line from a writer killed mid-append
+                    bad_lines.append(line)
         
-        # Use file locking for thread safety
-        lock_file = Path(f"{master_file_path}.lock")
+        # Set unreadable lines aside so they can't block later compactions
+        if bad_lines:
+            bad_path = f"{journal_path}.bad"
+            with open(bad_path, 'ab') as f:
+                f.write(b'\n'.join(bad_lines) + b'\n')
+            print(f"⚠️  Skipped {len(bad_lines)} unreadable journal lines (saved to {Path(bad_path).name})")
         
-        # Wait for lock
-        while lock_file.exists():
-            time.sleep(0.1)
+        if not new_records:
+            journal_path.unlink()
+            return 0
         
-        # Create lock
-        lock_file.touch()
+        items = [dumps_json_pretty(record) for record in new_records]
         
-        try:
-            # Load existing data
-            if master_path.exists():
-                try:
-                    with open(master_path, 'r', encoding='utf-8') as f:
-                        master_data = json.load(f)
-                    if not isinstance(master_data, list):
-                        master_data = [master_data]
-                except json.JSONDecodeError:
-                    master_data = []
-            else:
-                master_data = []
-            
-            # Append new metadata
-            master_data.append(metadata)
-            
-            # Save updated data
-            with open(master_path, 'w', encoding='utf-8') as f:
-                json.dump(master_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"📎 Appended to {master_path.name} (total: {len(master_data)} videos)")
-            
-        finally:
-            # Remove lock
-            if lock_file.exists():
-                lock_file.unlink()
+        if not master_path.exists() or master_path.stat().st_size == 0:
+            with open(master_path, 'wb') as f:
+                f.write(b'[\n' + indent_items(items) + b'\n]')
+        elif not append_items_in_place(items, master_path):
+            _rewrite_master(master_path, new_records)
         
-        return True
+        journal_path.unlink()
+        print(f"📎 Compacted {len(new_records)} videos into {master_path.name}")
+        return len(new_records)
         
     except Exception as e:
-        print(f"❌ Failed to append to master JSON: {e}")
-        if lock_file.exists():
-            lock_file.unlink()
-        return False
+        print(f"❌ Failed to compact {journal_path.name} into master JSON: {e}")
+        return 0
+
+
+def _read_url_from_folder(folder):
+    """Read the url field from a download folder's metadata.json, if any"""
+    metadata_file = os.path.join(folder, "metadata.json")
+    try:
+        with open(metadata_file, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️  Failed to read {metadata_file}: {e}")
+        return None
+    
+    try:
+        metadata = loads_json(data)
+        return metadata.get('url', '') or None
+    except Exception as e:
+        print(f"⚠️  Failed to read {metadata_file}: {e}")
+        return None
 
 
 def get_existing_urls(output_dir):
     """Scan existing downloads and get processed URLs"""
     existing_urls = set()
-    downloads_path = Path(output_dir)
     
-    if not downloads_path.exists():
+    if not os.path.exists(output_dir):
         return existing_urls
     
     print("🔍 Scanning existing downloads...")
     
-    for folder in downloads_path.iterdir():
-        if folder.is_dir():
-            metadata_file = folder / "metadata.json"
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    url = metadata.get('url', '')
-                    if url:
-                        existing_urls.add(url)
-                except Exception as e:
-                    print(f"⚠️  Failed to read {metadata_file}: {e}")
+    # DirEntry.is_dir() uses the cached d_type from readdir, so no extra stat() per folder
+    with os.scandir(output_dir) as it:
+        folders = [entry.path for entry in it if entry.is_dir()]
+    
+    # The scan is dominated by open()/read() latency, which threads overlap well
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        for url in executor.map(_read_url_from_folder, folders):
+            if url:
+                existing_urls.add(url)
     
     print(f"✅ Found {len(existing_urls)} existing downloads")
     return existing_urls
 
 
-def load_urls_from_file(file_path):
-    """Load URLs from file, excluding those marked as processed"""
+def iter_urls_from_file(file_path):
+    """Yield (url, is_processed) for each URL line in a single pass over the file.
+
+    Lines prefixed with '-' and URLs recorded in the processed journal are
+    reported as processed.
+    """
     if not os.path.exists(file_path):
         print(f"❌ File not found: {file_path}")
-        return [], []
+        return
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f if line.strip()]
+    journal = load_processed_journal(file_path)
     
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('-'):
+                if 'tiktok.com' in line[1:]:
+                    yield line[1:], True  # Remove the '-' prefix
+            elif 'tiktok.com' in line:
+                yield line, line in journal
+
+
+def load_urls_from_file(file_path):
+    """Load URLs from file, excluding those marked as processed"""
     unprocessed_urls = []
     processed_urls = []
     
-    for line in lines:
-        if line.startswith('-') and 'tiktok.com' in line[1:]:
-            processed_urls.append(line[1:])  # Remove the '-' prefix
-        elif 'tiktok.com' in line and not line.startswith('-'):
-            unprocessed_urls.append(line)
+    for url, is_processed in iter_urls_from_file(file_path):
+        (processed_urls if is_processed else unprocessed_urls).append(url)
     
     print(f"📋 File contains {len(unprocessed_urls)} unprocessed and {len(processed_urls)} processed URLs")
     return unprocessed_urls, processed_urls
 
 
-def worker_process(args_tuple):
-    """Worker function for multiprocessing"""
-    url, output_dir, quality, audio_only, append_file, use_whisper, whisper_device = args_tuple
+# Folders queued for deletion by a background thread (--clean with --append)
+_deletion_queue = queue.Queue()
+_deletion_thread = None
+
+
+def _deletion_worker():
+    while True:
+        folder = _deletion_queue.get()
+        try:
+            shutil.rmtree(folder, ignore_errors=True)
+        finally:
+            _deletion_queue.task_done()
+
+
+def schedule_folder_deletion(folder):
+    """Delete a finished video folder in the background, overlapping with downloads"""
+    global _deletion_thread
+    if _deletion_thread is None:
+        _deletion_thread = threading.Thread(target=_deletion_worker, daemon=True)
+        _deletion_thread.start()
+    _deletion_queue.put(folder)
+
+
+def wait_for_folder_deletions():
+    """Block until every scheduled folder deletion has finished"""
+    if _deletion_thread is not None:
+        _deletion_queue.join()
+
+
+# Per-worker state set once by init_worker when the pool starts: the
+# run-wide download settings and the whisper model
+_worker_cfg = None
+_worker_whisper_model = None
+_worker_whisper_device = "CPU"
+
+
+def init_worker(output_dir, quality, audio_only, append_file, use_whisper, whisper_device,
+                compute_type=None, num_workers=1):
+    """Pool initializer: store run settings and load the whisper model once per worker"""
+    global _worker_cfg, _worker_whisper_model, _worker_whisper_device
+    
+    _worker_cfg = SimpleNamespace(output_dir=output_dir, quality=quality, audio_only=audio_only,
+                                  append_file=append_file, use_whisper=use_whisper)
     
+    # Buffer the worker's per-video progress lines and write them out once per
+    # video (see worker_process) instead of one console write per print()
     try:
-        # Load whisper model in worker process if needed
-        whisper_model = None
-        if use_whisper and WHISPER_AVAILABLE:
-            whisper_model, actual_device = load_whisper_model(force_cpu=(whisper_device == "CPU"))
-            if whisper_model:
-                whisper_device = actual_device
+        sys.stdout.reconfigure(line_buffering=False)
+    except (AttributeError, ValueError):
+        pass
+    
+    if use_whisper and WHISPER_AVAILABLE:
+        model, actual_device = load_whisper_model(force_cpu=(whisper_device == "CPU"),
+                                                  compute_type=compute_type, num_workers=num_workers)
+        if model:
+            _worker_whisper_model = model
+            _worker_whisper_device = actual_device
+
+
+# Per-video limit (seconds) for a worker before it gives up on a URL
+WORKER_TIMEOUT = 300
+
+# Videos a pool worker handles before it is replaced (Python 3.11+)
+WORKER_MAX_TASKS = 25
+
+# Submitted-but-unfinished videos allowed per pool worker
+MAX_IN_FLIGHT_PER_WORKER = 2
+
+
+def get_worker_context():
+    """Multiprocessing context for the whisper pool.
+
+    On Linux a forkserver with yt-dlp and faster-whisper preloaded lets new
+    workers start without re-importing them, and avoids forking a parent
+    that may already have initialised CUDA. Elsewhere spawn is used.
+    """
+    if _PLATFORM == 'Linux' and 'forkserver' in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["yt_dlp", "faster_whisper"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+class DownloadTimeout(Exception):
+    """Raised inside a worker when a video exceeds WORKER_TIMEOUT"""
+
+
+def _worker_timeout_handler(signum, frame):
+    raise DownloadTimeout(f"Video processing exceeded {WORKER_TIMEOUT}s")
+
+
+def worker_process(url):
+    """Worker function for multiprocessing; settings come from init_worker"""
+    cfg = _worker_cfg
+    
+    # Enforce the per-video deadline inside the worker so a stalled download is
+    # actually interrupted and the worker slot freed. POSIX uses an interval
+    # timer; elsewhere a watchdog thread interrupts the worker's main thread.
+    use_timer = hasattr(signal, 'setitimer')
+    watchdog = None
+    timed_out = threading.Event()
+    if use_timer:
+        signal.signal(signal.SIGALRM, _worker_timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, WORKER_TIMEOUT)
+    else:
+        def expire():
+            timed_out.set()
+            _thread.interrupt_main()
+        watchdog = threading.Timer(WORKER_TIMEOUT, expire)
+        watchdog.daemon = True
+        watchdog.start()
+    
+    def disarm():
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        else:
+            watchdog.cancel()
+            watchdog.join()  # An expiry already under way has finished setting timed_out
+    
+    try:
+        result = download_single_video(url, cfg.output_dir, cfg.quality, cfg.audio_only, cfg.use_whisper,
+                                       _worker_whisper_model, _worker_whisper_device)
         
-        result = download_single_video(url, output_dir, quality, audio_only, use_whisper, whisper_model, whisper_device)
+        # The deadline covers the download only; an interrupt during the
+        # journal append would leave a torn line
+        disarm()
+        if timed_out.is_set():
+            return {'success': False, 'error': f"Video processing exceeded {WORKER_TIMEOUT}s", 'url': url}
         
-        if result['success'] and append_file:
-            append_to_master_json(result['metadata'], append_file)
+        if result['success'] and cfg.append_file:
+            result['appended'] = append_to_master_json(result['metadata'], cfg.append_file)
         
         return result
+    except KeyboardInterrupt:
+        if not timed_out.is_set():
+            raise
+        return {'success': False, 'error': f"Video processing exceeded {WORKER_TIMEOUT}s", 'url': url}
     except Exception as e:
         return {'success': False, 'error': str(e), 'url': url}
+    finally:
+        disarm()
+        sys.stdout.flush()
+
+
+# A download thread costs far less than a worker process, so the concurrent
+# (no-whisper) path runs this many downloads per requested worker. Safe because
+# threads skip the process-wide browser cleanup (cleanup=False) and every
+# video has its own folder, so no download touches another's files.
+DOWNLOADS_PER_WORKER = 4
+
+
+async def process_urls_async(urls, output_dir, quality, audio_only, append_file, url_file, concurrency=10,
+                             clean_folders=False):
+    """Download URLs concurrently from one process (no whisper).
+
+    Downloads are network-bound, so a thread per in-flight download driven by
+    an asyncio loop gives the same throughput as a process pool without the
+    per-process interpreter, import and pickling cost. Results are handled on
+    the event loop thread, so master/journal writes never overlap.
+    """
+    global shutdown_requested
+    
+    print(f"🚀 Starting concurrent download with {concurrency} parallel downloads")
+    print(f"📊 Processing {len(urls)} URLs")
+    
+    start_time = time.time()
+    results = []
+    processed_count = 0
+    
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    interrupted = False
+    download = functools.partial(download_single_video, output_dir=output_dir, quality=quality,
+                                 audio_only=audio_only, cleanup=False)
+    
+    try:
+        # Keep only as many downloads scheduled as there are threads, so
+        # memory doesn't grow with the length of the URL list
+        url_iter = iter(urls)
+        pending = set()
+        
+        while True:
+            while not shutdown_requested and len(pending) < concurrency:
+                url = next(url_iter, None)
+                if url is None:
+                    break
+                pending.add(loop.run_in_executor(pool, download, url))
+            
+            if not pending:
+                break
+            
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                processed_count += 1
+                
+                appended = bool(result['success'] and append_file
+                                and append_to_master_json(result['metadata'], append_file))
+                
+                # Mark as processed (attempted); recorded videos are written
+                # straight through, before their folder can be deleted
+                if url_file:
+                    mark_url_processed(url_file, result['url'], flush=appended)
+                
+                if result['success']:
+                    # Keep the folder if the record didn't reach the journal
+                    if appended and clean_folders:
+                        schedule_folder_deletion(result['folder'])
+                    print(f"✅ [{processed_count}/{len(urls)}] {result['metadata']['title'][:50]}...")
+                else:
+                    print(f"❌ [{processed_count}/{len(urls)}] Failed: {result.get('error', 'Unknown error')}")
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # Stop scheduling new downloads; the ones already running finish in
+        # their threads, but nothing waits for them here
+        shutdown_requested = True
+        interrupted = True
+        raise
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        if url_file:
+            flush_processed_urls(url_file)
+    
+    # Per-download cleanup is skipped in the threads (see download_single_video)
+    cleanup_memory()
+    kill_browser_processes()
+    
+    duration = time.time() - start_time
+    successful = sum(1 for r in results if r.get('success', False))
+    
+    print(f"\n⏱️  Concurrent download timing:")
+    print(f"   Total time: {duration:.2f} seconds ({duration/60:.1f} minutes)")
+    print(f"   Videos processed: {processed_count}/{len(urls)}")
+    print(f"   Successful downloads: {successful}")
+    print(f"   Average time per video: {duration/max(processed_count, 1):.2f} seconds")
+    
+    return results
 
 
 def process_urls_multi(urls, output_dir, quality, audio_only, append_file, url_file, num_processes=10, 
-                      use_whisper=False, whisper_device="CPU"):
+                      use_whisper=False, whisper_device="CPU", compute_type=None, clean_folders=False):
     """Process URLs using multiple processes"""
     global shutdown_requested
     
     if not urls:
         return []
     
+    # Without whisper there's no CPU-bound work, so skip the process pool
+    if not use_whisper:
+        try:
+            return asyncio.run(process_urls_async(
+                urls, output_dir, quality, audio_only, append_file, url_file,
+                num_processes * DOWNLOADS_PER_WORKER, clean_folders
+            ))
+        except KeyboardInterrupt:
+            print("🛑 Concurrent download interrupted")
+            shutdown_requested = True
+            return []
+    
     print(f"🚀 Starting multi-process download with {num_processes} workers")
     print(f"📊 Processing {len(urls)} URLs")
     
@@ -550,56 +1108,70 @@ def process_urls_multi(urls, output_dir, quality, audio_only, append_file, url_f
     results = []
     processed_count = 0
     
-    # Prepare arguments for workers
-    worker_args = [(url, output_dir, quality, audio_only, append_file, use_whisper, whisper_device) for url in urls]
+    pool_kwargs = {'mp_context': get_worker_context()}
+    if sys.version_info >= (3, 11):
+        # Recycle workers periodically so leaked yt-dlp/whisper memory is returned
+        # (max_tasks_per_child needs a non-fork start method)
+        pool_kwargs['max_tasks_per_child'] = WORKER_MAX_TASKS
     
     try:
-        with ProcessPoolExecutor(max_workers=num_processes) as executor:
-            # Submit all jobs
-            future_to_url = {
-                executor.submit(worker_process, args): args[0] 
-                for args in worker_args
-            }
+        with ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker,
+                                 initargs=(output_dir, quality, audio_only, append_file,
+                                           use_whisper, whisper_device, compute_type,
+                                           num_processes), **pool_kwargs) as executor:
+            # Keep only a small window of URLs queued so memory doesn't grow
+            # with the length of the URL list
+            max_in_flight = num_processes * MAX_IN_FLIGHT_PER_WORKER
+            url_iter = iter(urls)
+            pending = set()
             
-            # Process completed jobs
-            for future in as_completed(future_to_url):
+            while True:
+                while not shutdown_requested and len(pending) < max_in_flight:
+                    url = next(url_iter, None)
+                    if url is None:
+                        break
+                    pending.add(executor.submit(worker_process, url))
+                
                 if shutdown_requested:
                     print("🛑 Cancelling remaining downloads...")
                     executor.shutdown(wait=False, cancel_futures=True)
                     break
                 
-                url = future_to_url[future]
+                if not pending:
+                    break
                 
-                try:
-                    result = future.result(timeout=300)  # 5-minute timeout per video
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
                     results.append(result)
                     processed_count += 1
                     
+                    # The worker appends to the journal; keep the folder if that failed
+                    appended = result.get('appended', False)
+                    
+                    # Mark as processed (attempted or not); recorded videos are
+                    # written straight through, before their folder can be deleted
+                    if url_file:
+                        mark_url_processed(url_file, result['url'], flush=appended)
+                    
                     if result['success']:
-                        # Mark URL as processed
-                        if url_file:
-                            mark_url_processed(url_file, url)
-                        
+                        if clean_folders and appended:
+                            schedule_folder_deletion(result['folder'])
                         print(f"✅ [{processed_count}/{len(urls)}] {result['metadata']['title'][:50]}...")
                     else:
                         print(f"❌ [{processed_count}/{len(urls)}] Failed: {result.get('error', 'Unknown error')}")
-                        
-                        # Still mark as processed (attempted)
-                        if url_file:
-                            mark_url_processed(url_file, url)
-                
-                except Exception as e:
-                    print(f"❌ [{processed_count + 1}/{len(urls)}] Worker error: {e}")
-                    results.append({'success': False, 'error': str(e), 'url': url})
-                    processed_count += 1
-                    
-                    # Mark as processed (attempted)
-                    if url_file:
-                        mark_url_processed(url_file, url)
     
     except KeyboardInterrupt:
         print("🛑 Multi-process interrupted")
         shutdown_requested = True
+    except BrokenProcessPool as e:
+        # A worker died outside worker_process (OOM kill, segfault); the rest
+        # stay unmarked so the next run retries them
+        print(f"❌ Worker pool failed: {e}")
+        print(f"⚠️  {len(urls) - processed_count} URLs were not processed")
+    finally:
+        if url_file:
+            flush_processed_urls(url_file)
     
     end_time = time.time()
     duration = end_time - start_time
@@ -615,7 +1187,22 @@ def process_urls_multi(urls, output_dir, quality, audio_only, append_file, url_f
     return results
 
 
-def process_urls_sequential(urls, output_dir, quality, audio_only, append_file, url_file, use_whisper=False, whisper_model=None, whisper_device="CPU"):
+class RateLimiter:
+    """Enforce a minimum gap between requests, counting time already spent working"""
+    
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self.last = 0.0
+    
+    def wait(self):
+        gap = time.monotonic() - self.last
+        if gap < self.min_interval:
+            time.sleep(self.min_interval - gap)
+        self.last = time.monotonic()
+
+
+def process_urls_sequential(urls, output_dir, quality, audio_only, append_file, url_file, use_whisper=False, whisper_model=None, whisper_device="CPU",
+                            clean_folders=False):
     """Process URLs sequentially"""
     global shutdown_requested
     
@@ -626,6 +1213,9 @@ def process_urls_sequential(urls, output_dir, quality, audio_only, append_file,
     
     start_time = time.time()
     results = []
+    # At most one download start per second; a download that already took
+    # longer than that isn't followed by any extra pause
+    limiter = RateLimiter(1.0)
     
     for i, url in enumerate(urls, 1):
         if shutdown_requested:
@@ -633,20 +1223,23 @@ def process_urls_sequential(urls, output_dir, quality, audio_only, append_file,
             break
         
         print(f"\n[{i}/{len(urls)}] Processing: {url}")
-        mem_before = get_memory_usage()
         
         # Download video
+        limiter.wait()
         result = download_single_video(url, output_dir, quality, audio_only, use_whisper, whisper_model, whisper_device)
         results.append(result)
         
         if result['success']:
             # Append to master JSON if requested
-            if append_file:
-                append_to_master_json(result['metadata'], append_file)
+            appended = bool(append_file) and append_to_master_json(result['metadata'], append_file)
             
-            # Mark URL as processed
+            # Mark URL as processed; recorded videos are written straight
+            # through, before their folder can be deleted
             if url_file:
-                mark_url_processed(url_file, url)
+                mark_url_processed(url_file, url, flush=appended)
+            
+            if appended and clean_folders:
+                schedule_folder_deletion(result['folder'])
             
             print(f"✅ [{i}/{len(urls)}] Success: {result['metadata']['title'][:50]}...")
         else:
@@ -657,14 +1250,14 @@ def process_urls_sequential(urls, output_dir, quality, audio_only, append_file,
                 mark_url_processed(url_file, url)
         
         # Memory monitoring
-        mem_after = get_memory_usage()
+        mem_after = get_memory_usage_cached()
         if mem_after > 8000:  # 8GB threshold
             print(f"⚠️  High memory usage ({mem_after:.1f} MB), forcing cleanup...")
             cleanup_memory()
             kill_browser_processes()
-        
-        # Brief pause between downloads
-        time.sleep(1)
+    
+    if url_file:
+        flush_processed_urls(url_file)
     
     end_time = time.time()
     duration = end_time - start_time
@@ -689,14 +1282,21 @@ def main():
     parser.add_argument("--mp3", action="store_true", help="Download audio only as MP3")
     parser.add_argument("--from-file", "-ff", type=str, help="Process URLs from text file")
     parser.add_argument("--append", type=str, help="Append metadata to master JSON file (real-time)")
-    parser.add_argument("--clean", action="store_true", help="Clean up individual folders after ALL processing")
+    parser.add_argument("--clean", action="store_true", help="Clean up individual folders after ALL processing (with --append, as each video is recorded)")
     parser.add_argument("--whisper", action="store_true", help="Use faster-whisper for transcription")
     parser.add_argument("--force-cpu", action="store_true", help="Force CPU mode for whisper")
+    parser.add_argument("--compute-type", choices=COMPUTE_TYPE_CHOICES,
+                        help="Whisper compute type (default: int8_float16 on GPU, int8 on CPU)")
     parser.add_argument("--multi", action="store_true", help="Enable multi-process downloading (10 workers)")
     parser.add_argument("--processes", type=int, default=10, help="Number of worker processes (default: 10)")
     
     args = parser.parse_args()
     
+    if not YT_DLP_AVAILABLE:
+        print("Error: yt-dlp is not installed.")
+        print("Install it with: pip install yt-dlp")
+        sys.exit(1)
+    
     # Validate arguments
     if not args.url and not args.from_file:
         print("❌ Either provide a URL or use --from-file")
@@ -704,7 +1304,7 @@ def main():
     
     print("🚀 Robust TikTok Scraper v3.0")
     print("=" * 50)
-    print(f"Platform: {platform.system()}")
+    print(f"Platform: {_PLATFORM}")
     print(f"Memory usage: {get_memory_usage():.1f} MB")
     
     if args.url and "tiktok.com" not in args.url:
@@ -719,7 +1319,8 @@ def main():
     if args.whisper and not args.multi:
         if WHISPER_AVAILABLE:
             print("🎤 Loading Whisper model...")
-            whisper_model, whisper_device = load_whisper_model(force_cpu=args.force_cpu)
+            whisper_model, whisper_device = load_whisper_model(force_cpu=args.force_cpu,
+                                                               compute_type=args.compute_type)
             if not whisper_model:
                 print("❌ Failed to load Whisper model, transcription disabled")
                 args.whisper = False
@@ -738,35 +1339,51 @@ def main():
     results = []
     
     if args.from_file:
-        # Load URLs from file
-        unprocessed_urls, processed_urls = load_urls_from_file(args.from_file)
+        # Load URLs from file, checking existing downloads in the same pass
+        existing_urls = get_existing_urls(args.output)
+        urls_to_process = []
+        unprocessed_count = 0
+        processed_count = 0
         
-        if not unprocessed_urls:
+        for url, is_processed in iter_urls_from_file(args.from_file):
+            if is_processed:
+                processed_count += 1
+                continue
+            unprocessed_count += 1
+            if url not in existing_urls:
+                urls_to_process.append(url)
+                existing_urls.add(url)  # Queue each URL once even if the file repeats it
+        
+        print(f"📋 File contains {unprocessed_count} unprocessed and {processed_count} processed URLs")
+        
+        if not unprocessed_count:
             print("✅ All URLs in file have been processed!")
             return
         
-        # Check against existing downloads
-        existing_urls = get_existing_urls(args.output)
-        urls_to_process = [url for url in unprocessed_urls if url not in existing_urls]
-        
-        if len(urls_to_process) < len(unprocessed_urls):
-            skipped = len(unprocessed_urls) - len(urls_to_process)
-            print(f"⏭️  Skipping {skipped} URLs (already downloaded)")
+        if len(urls_to_process) < unprocessed_count:
+            skipped = unprocessed_count - len(urls_to_process)
+            print(f"⏭️  Skipping {skipped} URLs (already downloaded or duplicated)")
         
         if not urls_to_process:
             print("✅ All unprocessed URLs have already been downloaded!")
             return
         
+        # With --append the master journal keeps each video's metadata, so
+        # --clean can remove finished folders during the run instead of at the end
+        clean_folders = args.clean and bool(args.append)
+        
         # Process URLs
         if args.multi:
             results = process_urls_multi(
                 urls_to_process, args.output, args.quality, args.mp3, 
-                args.append, args.from_file, args.processes, args.whisper, whisper_device
+                args.append, args.from_file, args.processes, args.whisper, whisper_device,
+                args.compute_type, clean_folders
             )
         else:
             results = process_urls_sequential(
                 urls_to_process, args.output, args.quality, args.mp3, 
-                args.append, args.from_file, args.whisper, whisper_model, whisper_device
+                args.append, args.from_file, args.whisper, whisper_model, whisper_device,
+                clean_folders
             )
     else:
         # Single URL
@@ -804,6 +1421,13 @@ def main():
     if successful < total:
         print(f"❌ Failed: {total - successful}/{total}")
     
+    # Write this run's processed marks back into the URL file
+    if args.from_file:
+        compact_processed_urls(args.from_file)
+    
+    # Let background folder deletions finish before the final cleanup
+    wait_for_folder_deletions()
+    
     # Clean up only if ALL processing is complete and not interrupted
     if args.clean and not shutdown_requested and args.from_file:
         # Verify all URLs have been processed
@@ -820,6 +1444,10 @@ def main():
     elif args.clean and shutdown_requested:
         print("\n🚫 Cleanup skipped due to interrupted execution")
     
+    # Fold this run's appended records into the master JSON array
+    if args.append:
+        compact_master(args.append)
+    
     print(f"\n💾 Final memory usage: {get_memory_usage():.1f} MB")
 
 
@@ -8,40 +8,164 @@ import os
 import sys
 import time
 import json
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 
+try:
+    from pybloom_live import ScalableBloomFilter
+    BLOOM_AVAILABLE = True
+except ImportError:
+    BLOOM_AVAILABLE = False
+
+
+# All accepted TikTok video URL forms, compiled once and fused into one pattern
+_TIKTOK_RE = re.compile(
+    r'https?://(?:'
+    r'(?:www\.)?tiktok\.com/(?:@[^/\s"\'<>]+/video/\d+|t/[A-Za-z0-9]+)'
+    r'|(?:vm|vt)\.tiktok\.com/[A-Za-z0-9]+'
+    r'|t\.tiktok\.com/i18n/share/video/\d+'
+    r')'
+)
+
+# Host prefixes _TIKTOK_RE can match; startswith() rejects other links before the regex runs
+_TIKTOK_PREFIXES = tuple(
+    f"{scheme}://{host}/"
+    for scheme in ("https", "http")
+    for host in ("www.tiktok.com", "tiktok.com", "vm.tiktok.com", "vt.tiktok.com", "t.tiktok.com")
+)
+
+
+def _canonical_url(url):
+    """Strip tracking query (?_t=...&_r=...), fragment and trailing slash so variants dedupe"""
+    for sep in ('?', '#'):
+        i = url.find(sep)
+        if i != -1:
+            url = url[:i]
+    return url.rstrip('/')
+
+# Distinct hrefs of every video-like link on the page, read in one script call
+# as a flat list of strings (profile and navigation links are dropped in-page)
+COLLECT_HREFS_JS = """
+const seen = new Set();
+for (const a of document.querySelectorAll('a[href]')) {
+    const h = a.href;
+    if (h.includes('/video/') || h.includes('/t/') || h.includes('vm.tiktok.com') || h.includes('vt.tiktok.com')) {
+        seen.add(h);
+    }
+}
+return Array.from(seen);
+"""
+
+# Markup added since the previous pass (slightly overlapped so a URL split
+# across the boundary is still matched); the whole body when the page shrank,
+# was navigated, or arguments[0] asks for a full rescan
+NEW_MARKUP_JS = """
+const html = document.body ? document.body.innerHTML : '';
+const last = arguments[0] ? 0 : (window.__ttLastLen || 0);
+window.__ttLastLen = html.length;
+return last <= html.length ? html.slice(Math.max(0, last - 256)) : html;
+"""
+
+# Cheap fingerprint of the page (address, element and link counts) that
+# changes when content is added or the page navigates, without serializing it
+PAGE_SIGNATURE_JS = """
+return location.href + '|' + document.getElementsByTagName('*').length
+    + '|' + document.links.length;
+"""
+
+# Reconciliation passes between full page rescans, to catch in-place DOM rewrites
+FULL_SCAN_EVERY = 6
+
+# Seconds between reconciliation passes over the page (links and markup);
+# in between, new links come from the MutationObserver queue
+RECONCILE_INTERVAL = 5
+
+# Installs (once per page) a MutationObserver that queues the href of every
+# tiktok.com link added to the DOM, then waits up to arguments[0] ms for the
+# queue to fill and returns its contents. Navigation drops window state, so
+# the observer is re-installed on the next call.
+WAIT_FOR_NEW_HREFS_JS = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+if (!window.__ttQueue) {
+    window.__ttQueue = [];
+    const push = a => { if (a.href && a.href.includes('tiktok.com/')) window.__ttQueue.push(a.href); };
+    new MutationObserver(muts => {
+        for (const m of muts) for (const n of m.addedNodes) {
+            if (n.nodeType !== 1) continue;
+            if (n.matches('a[href]')) push(n);
+            n.querySelectorAll('a[href]').forEach(push);
+        }
+    }).observe(document.documentElement, {childList: true, subtree: true});
+}
+const start = Date.now();
+const drain = () => {
+    if (window.__ttQueue.length || Date.now() - start >= timeoutMs) {
+        const q = window.__ttQueue;
+        window.__ttQueue = [];
+        done(q);
+    } else {
+        setTimeout(drain, 100);
+    }
+};
+drain();
+"""
+
+# Collections a pooled browser serves before it is restarted (see FirefoxPool)
+MAX_USES_PER_INSTANCE = 20
+
+# href, creator and description for one video link, read from its tile
+VIDEO_METADATA_JS = """
+const link = arguments[0];
+const tile = link.closest("div[class*='DivItemContainerV2'], div[class*='video-feed-item']");
+const pick = sel => {
+    const el = tile && tile.querySelector(sel);
+    return el ? el.textContent : '';
+};
+return {
+    href: link.href,
+    creator: pick("[data-e2e='video-author-uniqueid'], .author-uniqueId, [class*='AuthorTitle']"),
+    desc: pick("[data-e2e='video-desc'], [class*='VideoCaption'], [class*='video-meta-title']")
+};
+"""
+
 
 class TikTokURLCollector:
-    def __init__(self, headless=False, debug=False):
+    def __init__(self, headless=False, debug=False, block_media=True, fast=None):
         self.headless = headless
         self.debug = debug
+        self.block_media = block_media
+        # Performance prefs default to on when nobody is watching the browser
+        self.fast = headless if fast is None else fast
+        # Bypassing a configured proxy is only done when --fast is asked for
+        self.direct_connection = fast is True
         self.collected_urls = set()
+        # With pybloom_live, URLs from earlier sessions go into a Bloom filter
+        # (a few bits each) and collected_urls only holds this session's URLs
+        self._history = None
+        self._history_count = 0
         self.driver = None
         self.output_file = "urls.txt"  # Changed to urls.txt
         self.json_output = "collected_metadata.json"
         self.profile_dir = Path.home() / ".tiktok_scraper_profile"  # Profile directory for cookies
+        self._url_fh = None  # Kept open for the session, see save_urls()
+        self._lock = threading.Lock()  # Guards collected_urls and the output files
+        self._stop = threading.Event()  # Stops parallel collection loops
         
-    def setup_stealth_firefox(self):
-        """Setup stealth Firefox with anti-detection measures and persistent profile"""
-        print("🚀 Setting up stealth Firefox...")
-        
-        # Create profile directory if it doesn't exist
-        self.profile_dir.mkdir(exist_ok=True)
-        print(f"📁 Using profile directory: {self.profile_dir}")
-        
+    def build_firefox_options(self, profile_dir):
+        """Firefox options with the stealth, privacy and media preferences for a profile"""
         options = Options()
         
         # Set the profile path to use persistent storage
         options.add_argument(f"-profile")
-        options.add_argument(str(self.profile_dir))
+        options.add_argument(str(profile_dir))
         
         # Headless mode if requested
         if self.headless:
@@ -62,7 +186,27 @@ class TikTokURLCollector:
         
         # Performance settings
         options.set_preference("javascript.enabled", True)
-        options.set_preference("permissions.default.image", 1)  # Allow images for better TikTok experience
+        if self.block_media:
+            # URLs live in the DOM, so images and video are only bandwidth and decode cost
+            options.set_preference("permissions.default.image", 2)
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.autoplay.blocking_policy", 2)
+            options.set_preference("media.volume_scale", "0.0")
+        else:
+            options.set_preference("permissions.default.image", 1)  # Allow images for better TikTok experience
+        
+        if self.fast:
+            # Skip background work that URL extraction doesn't need
+            if self.direct_connection:
+                options.set_preference("network.proxy.type", 0)  # Direct connection, no proxy lookup
+            options.set_preference("browser.safebrowsing.enabled", False)
+            options.set_preference("browser.safebrowsing.malware.enabled", False)
+            options.set_preference("browser.safebrowsing.phishing.enabled", False)
+            options.set_preference("toolkit.telemetry.enabled", False)
+            options.set_preference("datareporting.healthreport.uploadEnabled", False)
+            options.set_preference("layout.frame_rate", 10)  # Throttle requestAnimationFrame
+            options.set_preference("dom.min_background_timeout_value", 1000)
+            options.set_preference("browser.sessionstore.resume_from_crash", False)
         
         # TikTok-specific settings
         options.set_preference("network.http.referer.spoofSource", True)
@@ -71,11 +215,28 @@ class TikTokURLCollector:
         options.set_preference("network.cookie.cookieBehavior", 0)  # Accept all cookies
         options.set_preference("network.cookie.lifetimePolicy", 0)  # Keep cookies until they expire
         
+        return options
+    
+    def launch_firefox(self, profile_dir):
+        """Start a stealth Firefox driver on the given profile directory"""
+        driver = webdriver.Firefox(options=self.build_firefox_options(profile_dir))
+        # Headroom for WAIT_FOR_NEW_HREFS_JS, which blocks inside the page
+        driver.set_script_timeout(30)
+        
+        # Additional stealth measures
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
+    
+    def setup_stealth_firefox(self):
+        """Setup stealth Firefox with anti-detection measures and persistent profile"""
+        print("🚀 Setting up stealth Firefox...")
+        
+        # Create profile directory if it doesn't exist
+        self.profile_dir.mkdir(exist_ok=True)
+        print(f"📁 Using profile directory: {self.profile_dir}")
+        
         try:
-            self.driver = webdriver.Firefox(options=options)
-            
-            # Additional stealth measures
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self.driver = self.launch_firefox(self.profile_dir)
             
             print("✅ Stealth Firefox initialized with persistent profile")
             print("🍪 Cookies and login state will be preserved")
@@ -97,29 +258,12 @@ class TikTokURLCollector:
         }
         
         try:
-            # Get URL from element
-            url = element.get_attribute('href')
-            if url:
-                metadata["url"] = url
-                
-            # Try to get creator and description from nearby elements
-            parent = element.find_element(By.XPATH, "./ancestor::div[contains(@class, 'DivItemContainerV2') or contains(@class, 'video-feed-item')]")
-            
-            # Get creator
-            try:
-                creator_elem = parent.find_element(By.CSS_SELECTOR, "[data-e2e='video-author-uniqueid'], .author-uniqueId, [class*='AuthorTitle']")
-                if creator_elem:
-                    metadata["creator"] = creator_elem.text.strip()
-            except:
-                pass
-                
-            # Get description
-            try:
-                desc_elem = parent.find_element(By.CSS_SELECTOR, "[data-e2e='video-desc'], [class*='VideoCaption'], [class*='video-meta-title']")
-                if desc_elem:
-                    metadata["description"] = desc_elem.text.strip()
-            except:
-                pass
+            # Read href, creator and description in one browser round trip
+            found = self.driver.execute_script(VIDEO_METADATA_JS, element)
+            if found:
+                metadata["url"] = _canonical_url(found.get("href") or "")
+                metadata["creator"] = (found.get("creator") or "").strip()
+                metadata["description"] = (found.get("desc") or "").strip()
                 
         except Exception as e:
             if self.debug:
@@ -127,58 +271,21 @@ class TikTokURLCollector:
                 
         return metadata
     
-    def find_tiktok_urls(self):
+    def _collect_hrefs_js(self, driver=None):
+        """Return the href of every TikTok link on the page with a single script call"""
+        return (driver or self.driver).execute_script(COLLECT_HREFS_JS) or []
+    
+    def wait_for_new_urls(self, timeout, driver=None):
+        """Block until the page's MutationObserver reports new links (or timeout seconds pass)"""
+        hrefs = (driver or self.driver).execute_async_script(WAIT_FOR_NEW_HREFS_JS, int(timeout * 1000)) or []
+        return {_canonical_url(href) for href in hrefs if self.is_valid_tiktok_url(href)}
+    
+    def find_tiktok_urls(self, driver=None):
         """Find all TikTok video URLs on current page"""
         try:
-            found_urls = set()
-            
-            # Method 1: Find all links and filter TikTok video URLs
-            all_links = self.driver.find_elements(By.TAG_NAME, "a")
-            for link in all_links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and self.is_valid_tiktok_url(href):
-                        found_urls.add(href)
-                except:
-                    pass
-            
-            # Method 2: Try specific selectors for TikTok's structure
-            selectors = [
-                "[data-e2e='user-post-item-desc'] a",
-                "[data-e2e='browse-video-link']",
-                "div[class*='DivWrapper'] a[href*='/video/']",
-                "div[class*='DivItemContainer'] a",
-                "a[class*='StyledLink'][href*='/@']"
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        href = element.get_attribute('href')
-                        if href and self.is_valid_tiktok_url(href):
-                            found_urls.add(href)
-                except Exception as e:
-                    if self.debug:
-                        print(f"⚠️  Selector {selector}: {e}")
-            
-            # Method 3: Extract from data attributes
-            try:
-                # Some TikTok elements store URLs in data attributes
-                elements_with_data = self.driver.find_elements(By.CSS_SELECTOR, "[data-video-id], [data-item-id]")
-                for elem in elements_with_data:
-                    try:
-                        # Try to find associated links
-                        parent = elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'DivItemContainer') or contains(@class, 'video-feed')]")
-                        links = parent.find_elements(By.TAG_NAME, "a")
-                        for link in links:
-                            href = link.get_attribute('href')
-                            if href and self.is_valid_tiktok_url(href):
-                                found_urls.add(href)
-                    except:
-                        pass
-            except:
-                pass
+            # One DOM dump covers every <a>, including those the old per-selector
+            # and data-attribute lookups reached one element at a time
+            found_urls = {_canonical_url(href) for href in self._collect_hrefs_js(driver) if self.is_valid_tiktok_url(href)}
             
             if self.debug and found_urls:
                 print(f"🔍 Found {len(found_urls)} URLs in current view")
@@ -192,25 +299,21 @@ class TikTokURLCollector:
     
     def is_valid_tiktok_url(self, url):
         """Check if URL is a valid TikTok video URL"""
-        if not url:
+        if not url or not url.startswith(_TIKTOK_PREFIXES):
             return False
-            
-        patterns = [
-            r'https?://(?:www\.)?tiktok\.com/@[^/]+/video/\d+',
-            r'https?://(?:vm|vt)\.tiktok\.com/[A-Za-z0-9]+',
-            r'https?://(?:www\.)?tiktok\.com/t/[A-Za-z0-9]+',
-        ]
         
-        return any(re.match(pattern, url) for pattern in patterns)
+        return _TIKTOK_RE.match(url) is not None
     
     def save_urls(self, new_urls):
         """Save new URLs to file"""
         if not new_urls:
             return
             
-        with open(self.output_file, 'a', encoding='utf-8') as f:
-            for url in new_urls:
-                f.write(f"{url}\n")
+        if self._url_fh is None:
+            self._url_fh = open(self.output_file, 'a', encoding='utf-8', buffering=1 << 16)
+        
+        self._url_fh.writelines(f"{url}\n" for url in new_urls)
+        self._url_fh.flush()  # Keep the file current for anything reading it mid-session
         
         print(f"💾 Saved {len(new_urls)} new URLs to {self.output_file}")
     
@@ -235,17 +338,114 @@ class TikTokURLCollector:
         
         print(f"📊 Saved metadata for {len(metadata_list)} videos to {self.json_output}")
     
+    def load_existing_urls(self):
+        """Load URLs already in the output file so they aren't saved twice"""
+        if os.path.exists(self.output_file):
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                if BLOOM_AVAILABLE:
+                    self._history = ScalableBloomFilter(initial_capacity=1 << 20, error_rate=0.001)
+                    self._history_count = 0
+                    for line in f:
+                        url = _canonical_url(line.strip())
+                        # add() returns True if the URL was (probably) already there,
+                        # so repeated lines in the file are only counted once
+                        if url and not self._history.add(url):
+                            self._history_count += 1
+                    loaded = self._history_count
+                else:
+                    existing_urls = set(_canonical_url(line.strip()) for line in f if line.strip())
+                    self.collected_urls.update(existing_urls)
+                    loaded = len(existing_urls)
+                print(f"📚 Loaded {loaded} existing URLs from {self.output_file}")
+    
+    def total_collected(self):
+        """URLs collected so far, including those loaded from earlier sessions"""
+        return self._history_count + len(self.collected_urls)
+    
+    def record_new_urls(self, urls):
+        """Add URLs to the collected set, save the unseen ones and return them"""
+        new_urls = []
+        with self._lock:
+            # One pass that checks and records each URL, without building a
+            # difference set the size of everything collected so far
+            for url in urls:
+                if url in self.collected_urls:
+                    continue
+                # A Bloom filter false positive drops a URL that was never seen;
+                # at error_rate=0.001 that loses about 1 in 1000 new URLs
+                if self._history is not None and url in self._history:
+                    continue
+                self.collected_urls.add(url)
+                new_urls.append(url)
+            if new_urls:
+                self.save_urls(new_urls)
+        return new_urls
+    
+    def collect_loop(self, driver, stop_at=None, auto_scroll=False):
+        """Collect URLs from a driver's page until stop_at (monotonic time) or a stop request"""
+        check_interval = 1  # Longest wait for the page to report new content
+        reconcile_count = 0
+        last_reconcile = 0.0
+        last_signature = None
+        
+        while not self._stop.is_set() and (stop_at is None or time.monotonic() < stop_at):
+            if auto_scroll:
+                try:
+                    driver.execute_script("window.scrollBy(0, window.innerHeight);")
+                except Exception:
+                    pass
+            
+            # Wait for links the page's MutationObserver has seen being added;
+            # returns as soon as any arrive, so idle pages cost one call a second
+            try:
+                current_urls = self.wait_for_new_urls(check_interval, driver)
+            except Exception as e:
+                if self.debug:
+                    print(f"⚠️  Waiting for new links failed: {e}")
+                current_urls = set()
+                time.sleep(check_interval)
+            
+            # Periodically reconcile against the whole page, which also picks
+            # up links that changed in place and URLs hidden in the markup
+            if time.monotonic() - last_reconcile >= RECONCILE_INTERVAL:
+                full_scan = reconcile_count % FULL_SCAN_EVERY == 0
+                try:
+                    signature = driver.execute_script(PAGE_SIGNATURE_JS)
+                except Exception:
+                    signature = None
+                
+                # Nothing added since the last pass: skip the scans, except the
+                # periodic full one that catches links rewritten in place
+                if full_scan or signature is None or signature != last_signature:
+                    last_signature = signature
+                    current_urls |= self.find_tiktok_urls(driver)
+                    
+                    # Scan only the markup added since the last pass
+                    try:
+                        new_markup = driver.execute_script(NEW_MARKUP_JS, full_scan) or ""
+                        # Matches of the shared pattern are valid and canonical by construction
+                        current_urls.update(m.group(0) for m in _TIKTOK_RE.finditer(new_markup))
+                    except Exception:
+                        pass
+                reconcile_count += 1
+                last_reconcile = time.monotonic()
+            
+            new_urls = self.record_new_urls(current_urls)
+            
+            if new_urls:
+                # Don't extract metadata to avoid navigation
+                # Just show what we found
+                for url in (sorted(new_urls) if self.debug else new_urls):
+                    print(f"   ✅ Found: {url}")
+                print(f"📊 New URLs: +{len(new_urls)} | Total: {self.total_collected()}")
+    
     def start_collection(self, start_url="https://www.tiktok.com/foryou"):
         """Start the URL collection process"""
         if not self.setup_stealth_firefox():
             return False
         
         # Load existing URLs to avoid duplicates
-        if os.path.exists(self.output_file):
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                existing_urls = set(line.strip() for line in f if line.strip())
-                self.collected_urls.update(existing_urls)
-                print(f"📚 Loaded {len(existing_urls)} existing URLs from {self.output_file}")
+        self.load_existing_urls()
         
         print(f"🌐 Opening TikTok: {start_url}")
         self.driver.get(start_url)
@@ -264,47 +464,11 @@ class TikTokURLCollector:
         print("="*60)
         
         try:
-            last_count = len(self.collected_urls)
-            check_interval = 1  # Check every second for new content
-            
-            while True:
-                # Find new URLs on current page
-                current_urls = self.find_tiktok_urls()
-                
-                # Also search in page source for hidden URLs
-                try:
-                    page_source = self.driver.page_source
-                    # Find URLs in page source using regex
-                    source_urls = re.findall(r'https://www\.tiktok\.com/@[^/]+/video/\d+', page_source)
-                    for url in source_urls:
-                        if self.is_valid_tiktok_url(url):
-                            current_urls.add(url)
-                except:
-                    pass
-                
-                new_urls = current_urls - self.collected_urls
-                
-                if new_urls:
-                    self.collected_urls.update(new_urls)
-                    self.save_urls(new_urls)
-                    
-                    # Don't extract metadata to avoid navigation
-                    # Just show what we found
-                    for url in sorted(new_urls):
-                        print(f"   ✅ Found: {url}")
-                
-                # Status update only when count changes
-                current_count = len(self.collected_urls)
-                if current_count != last_count:
-                    new_count = current_count - last_count
-                    print(f"📊 New URLs: +{new_count} | Total: {current_count}")
-                    last_count = current_count
-                
-                time.sleep(check_interval)
+            self.collect_loop(self.driver)
                 
         except KeyboardInterrupt:
             print(f"\n🛑 Collection stopped by user")
-            print(f"📊 Total URLs collected: {len(self.collected_urls)}")
+            print(f"📊 Total URLs collected: {self.total_collected()}")
             print(f"💾 URLs saved to: {self.output_file}")
             
         except Exception as e:
@@ -325,12 +489,151 @@ class TikTokURLCollector:
                 self.driver.quit()
                 print("👋 Browser closed")
     
+    def collect_parallel(self, start_urls, workers=4, duration=300):
+        """Collect from several start URLs at once, each in a pooled browser that auto-scrolls"""
+        self.load_existing_urls()
+        self._stop.clear()
+        
+        print(f"🚀 Starting {min(workers, len(start_urls))} browsers for {len(start_urls)} start URLs")
+        pool = FirefoxPool(self, size=min(workers, len(start_urls)))
+        
+        def collect_one(start_url):
+            driver = None
+            try:
+                driver = pool.acquire()
+                print(f"🌐 Opening TikTok: {start_url}")
+                driver.get(start_url)
+                self.collect_loop(driver, stop_at=time.monotonic() + duration, auto_scroll=True)
+            except Exception as e:
+                print(f"❌ Collection failed for {start_url}: {e}")
+            finally:
+                if driver is not None:
+                    pool.release(driver)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                futures = [executor.submit(collect_one, url) for url in start_urls]
+                try:
+                    for future in futures:
+                        future.result()
+                except KeyboardInterrupt:
+                    print(f"\n🛑 Collection stopped by user")
+                    self._stop.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            pool.close()
+        
+        print(f"📊 Total URLs collected: {self.total_collected()}")
+        print(f"💾 URLs saved to: {self.output_file}")
+    
     def cleanup(self):
         """Clean up resources"""
+        if self._url_fh:
+            self._url_fh.close()
+            self._url_fh = None
         if self.driver:
             self.driver.quit()
 
 
+class FirefoxPool:
+    """Pre-started stealth Firefox drivers shared by parallel collection threads.
+
+    Firefox locks a profile to one process, so each driver runs on its own copy
+    of the collector's profile (keeping the login cookies). Drivers are
+    restarted after max_uses collections to keep browser memory in check.
+    """
+    
+    def __init__(self, collector, size=4, max_uses=MAX_USES_PER_INSTANCE):
+        self.collector = collector
+        self.size = size
+        self.max_uses = max_uses
+        self._base_dir = Path(tempfile.mkdtemp(prefix="tiktok_firefox_pool_"))
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._slots = {}
+        self._live = 0  # Drivers in the pool, idle or checked out
+        self._lock = threading.Lock()
+        
+        # Start the browsers concurrently; each launch takes a few seconds
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(self._start, slot) for slot in range(size)]
+        try:
+            for future in futures:
+                self._idle.put(future.result())
+                self._live += 1
+        except BaseException:
+            # Don't leak the browsers that did start, or their profile copies
+            for future in futures:
+                if future.done() and future.exception() is None:
+                    try:
+                        future.result().quit()
+                    except Exception:
+                        pass
+            shutil.rmtree(self._base_dir, ignore_errors=True)
+            raise
+    
+    def _start(self, slot):
+        profile_dir = self._base_dir / f"profile_{slot}"
+        if not profile_dir.exists():
+            if self.collector.profile_dir.exists():
+                # Only the cookies and prefs are needed; skip the lock files and
+                # the caches/session backups, which can be hundreds of MB each
+                shutil.copytree(self.collector.profile_dir, profile_dir,
+                                ignore=shutil.ignore_patterns("lock", ".parentlock", "parent.lock",
+                                                              "cache2", "startupCache", "storage",
+                                                              "sessionstore-backups"))
+            else:
+                profile_dir.mkdir(parents=True)
+        
+        driver = self.collector.launch_firefox(profile_dir)
+        self._uses[driver] = 0
+        self._slots[driver] = slot
+        return driver
+    
+    def acquire(self):
+        """Take an idle driver, waiting for one if all are busy"""
+        while True:
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                with self._lock:
+                    if self._live == 0:
+                        raise RuntimeError("No Firefox instances left in the pool")
+    
+    def release(self, driver):
+        """Return a driver to the pool, restarting it once it has served max_uses"""
+        self._uses[driver] += 1
+        if self._uses[driver] >= self.max_uses:
+            slot = self._slots.pop(driver)
+            del self._uses[driver]
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = None
+            for attempt in range(2):
+                try:
+                    driver = self._start(slot)
+                    break
+                except Exception as e:
+                    print(f"⚠️  Failed to restart Firefox (attempt {attempt + 1}): {e}")
+            if driver is None:
+                # Drop the slot so acquire() gives up instead of waiting forever
+                with self._lock:
+                    self._live -= 1
+                return
+        self._idle.put(driver)
+    
+    def close(self):
+        """Quit every driver and remove the profile copies"""
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait().quit()
+            except Exception:
+                pass
+        shutil.rmtree(self._base_dir, ignore_errors=True)
+
+
 def main():
     import argparse
     
@@ -341,6 +644,18 @@ def main():
                        help="Enable debug output")
     parser.add_argument("--start-url", default="https://www.tiktok.com/foryou",
                        help="Starting URL (default: TikTok For You page)")
+    parser.add_argument("--start-urls", nargs="+",
+                       help="Collect from several start URLs (users, hashtags) in parallel browsers")
+    parser.add_argument("--workers", type=int, default=4,
+                       help="Parallel browsers for --start-urls (default: 4)")
+    parser.add_argument("--duration", type=int, default=300,
+                       help="Seconds to auto-scroll each --start-urls page (default: 300)")
+    parser.add_argument("--block-media", action=argparse.BooleanOptionalAction, default=True,
+                       help="Block images and video autoplay to speed up collection "
+                            "(default: on; use --no-block-media when browsing manually)")
+    parser.add_argument("--fast", action=argparse.BooleanOptionalAction, default=None,
+                       help="Disable safebrowsing/telemetry and throttle animations "
+                            "(default: on with --headless); passing --fast also bypasses any proxy")
     parser.add_argument("--output", default="urls.txt",
                        help="Output file for URLs (default: urls.txt)")
     parser.add_argument("--json-output", default="collected_metadata.json", 
@@ -360,12 +675,16 @@ def main():
         print("❌ Selenium not installed. Install with: pip install selenium")
         sys.exit(1)
     
-    collector = TikTokURLCollector(headless=args.headless, debug=args.debug)
+    collector = TikTokURLCollector(headless=args.headless, debug=args.debug, block_media=args.block_media,
+                                   fast=args.fast)
     collector.output_file = args.output
     collector.json_output = args.json_output
     
     try:
-        collector.start_collection(args.start_url)
+        if args.start_urls:
+            collector.collect_parallel(args.start_urls, args.workers, args.duration)
+        else:
+            collector.start_collection(args.start_url)
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
     except Exception as e:
@@ -8,89 +8,316 @@ Uses existing TikTokApi infrastructure with ms_token authentication
 """
 
 import asyncio
-import json
+import functools
 import time
 import random
 import re
 from pathlib import Path
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from TikTokApi import TikTokApi
+try:
+    from TikTokApi.exceptions import CaptchaException, EmptyResponseException
+    _RATE_LIMIT_EXCEPTIONS = (CaptchaException, EmptyResponseException)
+except ImportError:
+    _RATE_LIMIT_EXCEPTIONS = ()
 import sys
 import os
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Repo root, so the shared helpers in scripts/utils import when run as a script
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from scripts.utils.fast_json import dumps_json, dumps_json_pretty
+
 # Import MS_TOKEN from comment_extractor
 from comment_extractor import MS_TOKEN
 
+# Hashtags, searches or user profiles paginated at the same time within a
+# collection method; kept low so one ms_token doesn't trip rate limits
+MAX_CONCURRENT_QUERIES = 8
+
+# Metadata records written to the JSONL sidecar between flushes
+JSONL_FLUSH_EVERY = 200
+
+# Videos per second taken from the API across all queries, with a burst of
+# about one results page; halved on each rate-limit error, then recovered
+# to the full rate over RATE_RECOVERY_SECONDS
+VIDEO_RATE = 40.0
+VIDEO_BURST = 30
+RATE_RECOVERY_SECONDS = 60.0
+
+# Restarts of a query that failed with a rate-limit error, waiting about
+# 1s, 2s, then 4s (plus jitter) before each
+QUERY_RETRIES = 3
+
+# Error text that reports an HTTP 429 or throttling; the status code must be
+# a whole number next to a status word, so video ids containing 429 don't match
+_RATE_LIMIT_RE = re.compile(
+    r'\b(?:status|http|code|error)\W{0,3}(?:code\W{0,3})?429\b|too many requests|rate.?limit',
+    re.IGNORECASE,
+)
+
+
+def is_rate_limit_error(error):
+    """Whether an API error looks like throttling rather than a bad query"""
+    if isinstance(error, _RATE_LIMIT_EXCEPTIONS):
+        return True
+    status = getattr(error, 'status', None) or getattr(error, 'status_code', None)
+    if status == 429:
+        return True
+    return bool(_RATE_LIMIT_RE.search(str(error)))
+
+
+class AsyncTokenBucket:
+    """Token bucket shared by concurrent queries, with multiplicative backoff on rate limits"""
+    
+    def __init__(self, rate=VIDEO_RATE, capacity=VIDEO_BURST, min_rate=0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()  # Waiters queue in FIFO order
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        # Climb back toward the full rate after a penalty
+        self.rate = min(self.max_rate, self.rate + elapsed * self.max_rate / RATE_RECOVERY_SECONDS)
+    
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+    
+    def penalize(self):
+        """Halve the rate and drain the bucket after a rate-limit error"""
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        print(f"   🐢 Rate limited, slowing to {self.rate:.1f} videos/s")
+
+
+class QueryBudget:
+    """A collection target shared by concurrent queries.
+
+    Each query claims its share of what is left when it starts, so queries
+    started together don't all paginate for the whole remainder.
+    """
+    
+    def __init__(self, count):
+        self.count = count
+        self.collected = 0
+        self._claimed = 0  # Claimed by running queries but not collected yet
+    
+    def claim(self, limit):
+        """Reserve up to limit videos for a new query; 0 once nothing is left"""
+        share = max(0, min(limit, self.count - self.collected - self._claimed))
+        self._claimed += share
+        return share
+    
+    def add(self):
+        """Count one video collected against a claim"""
+        self.collected += 1
+        self._claimed -= 1
+    
+    def release(self, share, got):
+        """Give back the unused part of a claim when its query ends"""
+        self._claimed -= share - got
+    
+    def done(self):
+        return self.collected >= self.count
+
+
+@dataclass(slots=True)
+class VideoMetadata:
+    """Metadata for one harvested video; slots keep each record much smaller than a dict"""
+    url: str
+    video_id: str
+    username: str
+    description: str
+    view_count: int
+    like_count: int
+    comment_count: int
+    share_count: int
+    collection_method: str
+    collected_at: str
+    # Where the video came from, depending on the collection method
+    hashtag: str | None = None
+    search_term: str | None = None
+    source_hashtag: str | None = None
+    
+    @classmethod
+    def from_video(cls, video, url, collection_method, collected_at, username=None, **source):
+        """Build the record for a TikTokApi video; source is hashtag, search_term or source_hashtag"""
+        stats = video.stats
+        return cls(
+            url=url,
+            video_id=video.id,
+            username=username or video.author.username,
+            description=video.as_dict.get('desc', ''),
+            view_count=stats.get('playCount', 0),
+            like_count=stats.get('diggCount', 0),
+            comment_count=stats.get('commentCount', 0),
+            share_count=stats.get('shareCount', 0),
+            collection_method=collection_method,
+            collected_at=collected_at,
+            **source
+        )
+    
+    def to_dict(self):
+        """Plain dict for JSON output, without the source fields that don't apply"""
+        record = asdict(self)
+        for key in ('hashtag', 'search_term', 'source_hashtag'):
+            if record[key] is None:
+                del record[key]
+        return record
+
+
 class TikTokURLHarvester:
     """
     Harvest TikTok URLs using multiple collection strategies
     """
     
-    def __init__(self, ms_token=MS_TOKEN, max_urls_per_method=500):
+    # Query pools shared by all instances; dict.fromkeys drops repeated
+    # entries (keeping order), which would otherwise bias random.sample
+    
+    # Popular hashtags for harvesting
+    TRENDING_HASHTAGS = tuple(dict.fromkeys([
+        'fyp', 'foryou', 'viral', 'trending', 'xyzbca', 'foryoupage',
+        'comedy', 'funny', 'meme', 'relatable', 'storytime', 'pov',
+        'aesthetic', 'lifestyle', 'motivation', 'inspiration', 'facts',
+        'relationship', 'dating', 'love', 'breakup', 'toxic', 'redflags',
+        'cooking', 'recipe', 'food', 'foodtok', 'health', 'fitness',
+        'skincare', 'makeup', 'fashion', 'ootd', 'style', 'haul',
+        'diy', 'crafts', 'lifehack', 'tips', 'howto', 'tutorial',
+        'dance', 'music', 'singing', 'art', 'drawing', 'painting',
+        'gaming', 'twitch', 'anime', 'marvel', 'disney', 'movies',
+        'books', 'booktok', 'reading', 'writing', 'poetry', 'quotes',
+        'school', 'college', 'work', 'career', 'money', 'business',
+        'travel', 'adventure', 'nature', 'photography', 'sunset',
+        'pets', 'dogs', 'cats', 'animals', 'cute', 'wholesome',
+        'mystery', 'scary', 'horror', 'paranormal', 'conspiracy',
+        'reddit', 'askreddit', 'storytime', 'drama', 'tea', 'gossip'
+    ]))
+    
+    # Popular search terms
+    SEARCH_TERMS = tuple(dict.fromkeys([
+        'viral video', 'funny moment', 'epic fail', 'plot twist',
+        'satisfying', 'oddly satisfying', 'life hack', 'mind blown',
+        'you won\'t believe', 'wait for it', 'watch till the end',
+        'part 2', 'story time', 'green screen', 'duet this',
+        'try not to laugh', 'reaction', 'behind the scenes',
+        'day in my life', 'get ready with me', 'what I eat',
+        'morning routine', 'night routine', 'self care',
+        'transformation', 'before and after', 'glow up',
+        'outfit of the day', 'room tour', 'apartment tour',
+        'cooking with me', 'baking', 'recipe', 'food review',
+        'product review', 'unboxing', 'haul', 'try on',
+        'workout', 'gym', 'fitness motivation', 'weight loss',
+        'skincare routine', 'makeup tutorial', 'hair care',
+        'study with me', 'productivity', 'motivation', 'success',
+        'small business', 'entrepreneur', 'side hustle', 'passive income'
+    ]))
+    
+    # Target user types (we'll search for these patterns)
+    USER_PATTERNS = tuple(dict.fromkeys([
+        'comedy', 'funny', 'meme', 'viral', 'trending',
+        'lifestyle', 'aesthetic', 'motivation', 'inspiration',
+        'food', 'cooking', 'recipe', 'chef', 'baker',
+        'fashion', 'style', 'outfit', 'ootd', 'haul',
+        'beauty', 'makeup', 'skincare', 'hair', 'nails',
+        'fitness', 'gym', 'workout', 'health', 'wellness',
+        'dance', 'music', 'singing', 'art', 'creative',
+        'gaming', 'gamer', 'streamer', 'anime', 'nerd',
+        'book', 'reading', 'writer', 'poetry', 'quotes',
+        'travel', 'adventure', 'nature', 'photography',
+        'pets', 'dogs', 'cats', 'animals', 'cute',
+        'mystery', 'horror', 'scary', 'paranormal',
+        'reddit', 'story', 'drama', 'tea', 'gossip'
+    ]))
+    
+    def __init__(self, ms_token=MS_TOKEN, max_urls_per_method=500, jsonl_output="harvested_urls.jsonl",
+                 metadata=True, pretty=False):
         self.ms_token = ms_token
         self.max_urls_per_method = max_urls_per_method
-        self.collected_urls = set()  # Use set to avoid duplicates
+        self.videos = {}  # Video id -> URL, in collection order; doubles as the dedup index
         self.url_metadata = []  # Store URLs with metadata
+        self.methods_used = set()  # collection_method of every metadata record
+        self.keep_metadata = metadata  # False skips building per-video metadata records
+        self.pretty = pretty  # Indent the JSON output for reading; compact by default
         
-        # Popular hashtags for harvesting
-        self.trending_hashtags = [
-            'fyp', 'foryou', 'viral', 'trending', 'xyzbca', 'foryoupage',
-            'comedy', 'funny', 'meme', 'relatable', 'storytime', 'pov',
-            'aesthetic', 'lifestyle', 'motivation', 'inspiration', 'facts',
-            'relationship', 'dating', 'love', 'breakup', 'toxic', 'redflags',
-            'cooking', 'recipe', 'food', 'foodtok', 'health', 'fitness',
-            'skincare', 'makeup', 'fashion', 'ootd', 'style', 'haul',
-            'diy', 'crafts', 'lifehack', 'tips', 'howto', 'tutorial',
-            'dance', 'music', 'singing', 'art', 'drawing', 'painting',
-            'gaming', 'twitch', 'anime', 'marvel', 'disney', 'movies',
-            'books', 'booktok', 'reading', 'writing', 'poetry', 'quotes',
-            'school', 'college', 'work', 'career', 'money', 'business',
-            'travel', 'adventure', 'nature', 'photography', 'sunset',
-            'pets', 'dogs', 'cats', 'animals', 'cute', 'wholesome',
-            'mystery', 'scary', 'horror', 'paranormal', 'conspiracy',
-            'reddit', 'askreddit', 'storytime', 'drama', 'tea', 'gossip'
-        ]
+        # Every record is also appended here as it's collected, so a crash or
+        # ban mid-run doesn't lose what was already harvested
+        self.jsonl_output = jsonl_output
+        self._jsonl_fh = None
+        self._unflushed = 0
+        
+        # Paces every query from every collection method
+        self.bucket = AsyncTokenBucket()
+
+    @asynccontextmanager
+    async def api_session(self, api=None, num_sessions=1):
+        """Yield the given API, or open one with its own sessions when a method runs standalone"""
+        if api is not None:
+            yield api
+            return
         
-        # Popular search terms
-        self.search_terms = [
-            'viral video', 'funny moment', 'epic fail', 'plot twist',
-            'satisfying', 'oddly satisfying', 'life hack', 'mind blown',
-            'you won\'t believe', 'wait for it', 'watch till the end',
-            'part 2', 'story time', 'green screen', 'duet this',
-            'try not to laugh', 'reaction', 'behind the scenes',
-            'day in my life', 'get ready with me', 'what I eat',
-            'morning routine', 'night routine', 'self care',
-            'transformation', 'before and after', 'glow up',
-            'outfit of the day', 'room tour', 'apartment tour',
-            'cooking with me', 'baking', 'recipe', 'food review',
-            'product review', 'unboxing', 'haul', 'try on',
-            'workout', 'gym', 'fitness motivation', 'weight loss',
-            'skincare routine', 'makeup tutorial', 'hair care',
-            'study with me', 'productivity', 'motivation', 'success',
-            'small business', 'entrepreneur', 'side hustle', 'passive income'
-        ]
+        async with TikTokApi() as api:
+            await api.create_sessions(
+                ms_tokens=[self.ms_token], 
+                num_sessions=num_sessions, 
+                sleep_after=1,
+                suppress_resource_load_types=["image", "media", "font", "stylesheet"]
+            )
+            yield api
+
+    async def paginate(self, query, count, label, stop=None):
+        """Iterate query(count=count), restarting it with exponential backoff after rate-limit errors.
         
-        # Target user types (we'll search for these patterns)
-        self.user_patterns = [
-            'comedy', 'funny', 'meme', 'viral', 'trending',
-            'lifestyle', 'aesthetic', 'motivation', 'inspiration',
-            'food', 'cooking', 'recipe', 'chef', 'baker',
-            'fashion', 'style', 'outfit', 'ootd', 'haul',
-            'beauty', 'makeup', 'skincare', 'hair', 'nails',
-            'fitness', 'gym', 'workout', 'health', 'wellness',
-            'dance', 'music', 'singing', 'art', 'creative',
-            'gaming', 'gamer', 'streamer', 'anime', 'nerd',
-            'book', 'reading', 'writer', 'poetry', 'quotes',
-            'travel', 'adventure', 'nature', 'photography',
-            'pets', 'dogs', 'cats', 'animals', 'cute',
-            'mystery', 'horror', 'scary', 'paranormal',
-            'reddit', 'story', 'drama', 'tea', 'gossip'
-        ]
-
-    async def collect_trending_urls(self, count=200):
+        stop() is checked before each item is requested (and so before each
+        page fetch) and before a retry; iteration ends once it returns True.
+        A restarted query may return videos that were already yielded; callers
+        drop those by id through self.videos.
+        """
+        for attempt in range(QUERY_RETRIES + 1):
+            if stop and stop():
+                return
+            videos = query(count=count)
+            try:
+                while not (stop and stop()):
+                    try:
+                        video = await videos.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    yield video
+                return
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                # The only place the bucket is penalized, so callers just report the error
+                self.bucket.penalize()
+                if attempt == QUERY_RETRIES:
+                    raise
+                delay = 2 ** attempt + random.random()
+                print(f"   🔁 Retrying {label} in {delay:.1f}s after: {e}")
+                await asyncio.sleep(delay)
+            finally:
+                if hasattr(videos, 'aclose'):
+                    await videos.aclose()
+
+    async def collect_trending_urls(self, count=200, api=None):
         """
         Collect URLs from trending videos
         """
@@ -98,44 +325,27 @@ class TikTokURLHarvester:
         collected = 0
         
         try:
-            async with TikTokApi() as api:
-                await api.create_sessions(
-                    ms_tokens=[self.ms_token], 
-                    num_sessions=1, 
-                    sleep_after=1,
-                    suppress_resource_load_types=["image", "media", "font", "stylesheet"]
-                )
+            async with self.api_session(api) as api:
+                # Timestamps are refreshed every 50 videos rather than per video
+                collected_at = datetime.now().isoformat()
                 
-                async for video in api.trending.videos(count=count):
-                    if collected >= count:
-                        break
+                async for video in self.paginate(api.trending.videos, count, "trending",
+                                                 stop=lambda: collected >= count):
+                    if video.id not in self.videos:
+                        url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
                         
-                    url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
-                    
-                    if url not in self.collected_urls:
-                        self.collected_urls.add(url)
-                        
-                        # Store metadata
-                        metadata = {
-                            'url': url,
-                            'video_id': video.id,
-                            'username': video.author.username,
-                            'description': video.as_dict.get('desc', ''),
-                            'view_count': video.stats.get('playCount', 0),
-                            'like_count': video.stats.get('diggCount', 0),
-                            'comment_count': video.stats.get('commentCount', 0),
-                            'share_count': video.stats.get('shareCount', 0),
-                            'collection_method': 'trending',
-                            'collected_at': datetime.now().isoformat()
-                        }
-                        self.url_metadata.append(metadata)
+                        metadata = None
+                        if self.keep_metadata:
+                            metadata = VideoMetadata.from_video(video, url, 'trending', collected_at)
+                        self.add_video(video.id, url, metadata)
                         collected += 1
                         
                         if collected % 50 == 0:
                             print(f"   ✅ Collected {collected} trending URLs")
+                            collected_at = datetime.now().isoformat()
                     
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.1)
+                    # Shared pacing to avoid rate limiting
+                    await self.bucket.acquire()
                     
         except Exception as e:
             print(f"❌ Error collecting trending URLs: {e}")
@@ -143,270 +353,291 @@ class TikTokURLHarvester:
         print(f"✅ Collected {collected} trending URLs")
         return collected
 
-    async def collect_hashtag_urls(self, count=300):
+    async def collect_hashtag_urls(self, count=300, api=None):
         """
         Collect URLs from popular hashtags
         """
         print(f"#️⃣ Collecting {count} hashtag video URLs...")
-        collected = 0
+        budget = QueryBudget(count)
         hashtags_used = 0
         
         try:
-            async with TikTokApi() as api:
-                await api.create_sessions(
-                    ms_tokens=[self.ms_token], 
-                    num_sessions=1, 
-                    sleep_after=1,
-                    suppress_resource_load_types=["image", "media", "font", "stylesheet"]
-                )
-                
+            async with self.api_session(api) as api:
                 # Shuffle hashtags for variety
-                hashtags = random.sample(self.trending_hashtags, min(len(self.trending_hashtags), 20))
+                hashtags = random.sample(self.TRENDING_HASHTAGS, min(len(self.TRENDING_HASHTAGS), 20))
+                sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
                 
-                for hashtag in hashtags:
-                    if collected >= count:
-                        break
+                async def harvest_hashtag(hashtag):
+                    nonlocal hashtags_used
+                    async with sem:
+                        target_per_hashtag = budget.claim(25)
+                        if not target_per_hashtag:
+                            return
+                            
+                        hashtags_used += 1
+                        hashtag_collected = 0
                         
-                    hashtags_used += 1
-                    hashtag_collected = 0
-                    target_per_hashtag = min(25, (count - collected))
-                    
-                    print(f"   🔍 Harvesting #{hashtag} (target: {target_per_hashtag})")
-                    
-                    try:
-                        async for video in api.hashtag(name=hashtag).videos(count=target_per_hashtag):
-                            if collected >= count or hashtag_collected >= target_per_hashtag:
-                                break
+                        print(f"   🔍 Harvesting #{hashtag} (target: {target_per_hashtag})")
+                        
+                        # One timestamp and method label per query, not per video
+                        collection_method = f'hashtag_{hashtag}'
+                        collected_at = datetime.now().isoformat()
+                        
+                        def hashtag_done():
+                            return budget.done() or hashtag_collected >= target_per_hashtag
+                        
+                        try:
+                            async for video in self.paginate(api.hashtag(name=hashtag).videos, target_per_hashtag,
+                                                             f"#{hashtag}", stop=hashtag_done):
+                                if video.id not in self.videos:
+                                    url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
+                                    
+                                    metadata = None
+                                    if self.keep_metadata:
+                                        metadata = VideoMetadata.from_video(video, url, collection_method, collected_at, hashtag=hashtag)
+                                    self.add_video(video.id, url, metadata)
+                                    budget.add()
+                                    hashtag_collected += 1
                                 
-                            url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
-                            
-                            if url not in self.collected_urls:
-                                self.collected_urls.add(url)
+                                await self.bucket.acquire()
                                 
-                                # Store metadata
-                                metadata = {
-                                    'url': url,
-                                    'video_id': video.id,
-                                    'username': video.author.username,
-                                    'description': video.as_dict.get('desc', ''),
-                                    'view_count': video.stats.get('playCount', 0),
-                                    'like_count': video.stats.get('diggCount', 0),
-                                    'comment_count': video.stats.get('commentCount', 0),
-                                    'share_count': video.stats.get('shareCount', 0),
-                                    'collection_method': f'hashtag_{hashtag}',
-                                    'hashtag': hashtag,
-                                    'collected_at': datetime.now().isoformat()
-                                }
-                                self.url_metadata.append(metadata)
-                                collected += 1
-                                hashtag_collected += 1
-                            
-                            await asyncio.sleep(0.1)
-                            
-                    except Exception as e:
-                        print(f"   ⚠️ Error with hashtag #{hashtag}: {e}")
-                        continue
-                    
-                    print(f"   ✅ Got {hashtag_collected} URLs from #{hashtag}")
-                    
-                    # Delay between hashtags
-                    await asyncio.sleep(random.uniform(2, 5))
+                        except Exception as e:
+                            print(f"   ⚠️ Error with hashtag #{hashtag}: {e}")
+                            return
+                        finally:
+                            budget.release(target_per_hashtag, hashtag_collected)
+                        
+                        print(f"   ✅ Got {hashtag_collected} URLs from #{hashtag}")
+                        
+                        # Delay before this slot moves on to another hashtag
+                        await asyncio.sleep(random.uniform(2, 5))
+                
+                await asyncio.gather(*(harvest_hashtag(hashtag) for hashtag in hashtags))
                     
         except Exception as e:
             print(f"❌ Error collecting hashtag URLs: {e}")
         
-        print(f"✅ Collected {collected} hashtag URLs from {hashtags_used} hashtags")
-        return collected
+        print(f"✅ Collected {budget.collected} hashtag URLs from {hashtags_used} hashtags")
+        return budget.collected
 
-    async def collect_search_urls(self, count=200):
+    async def collect_search_urls(self, count=200, api=None):
         """
         Collect URLs from search terms
         """
         print(f"🔍 Collecting {count} search result URLs...")
-        collected = 0
+        budget = QueryBudget(count)
         searches_used = 0
         
         try:
-            async with TikTokApi() as api:
-                await api.create_sessions(
-                    ms_tokens=[self.ms_token], 
-                    num_sessions=1, 
-                    sleep_after=1,
-                    suppress_resource_load_types=["image", "media", "font", "stylesheet"]
-                )
-                
+            async with self.api_session(api) as api:
                 # Shuffle search terms for variety
-                search_terms = random.sample(self.search_terms, min(len(self.search_terms), 15))
+                search_terms = random.sample(self.SEARCH_TERMS, min(len(self.SEARCH_TERMS), 15))
+                sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
                 
-                for term in search_terms:
-                    if collected >= count:
-                        break
+                async def harvest_search(term):
+                    nonlocal searches_used
+                    async with sem:
+                        target_per_search = budget.claim(20)
+                        if not target_per_search:
+                            return
+                            
+                        searches_used += 1
+                        search_collected = 0
                         
-                    searches_used += 1
-                    search_collected = 0
-                    target_per_search = min(20, (count - collected))
-                    
-                    print(f"   🔍 Searching '{term}' (target: {target_per_search})")
-                    
-                    try:
-                        async for video in api.search.videos(term, count=target_per_search):
-                            if collected >= count or search_collected >= target_per_search:
-                                break
+                        print(f"   🔍 Searching '{term}' (target: {target_per_search})")
+                        
+                        # One timestamp and method label per query, not per video
+                        collection_method = f'search_{term.replace(" ", "_")}'
+                        collected_at = datetime.now().isoformat()
+                        
+                        def search_done():
+                            return budget.done() or search_collected >= target_per_search
+                        
+                        try:
+                            async for video in self.paginate(functools.partial(api.search.videos, term), target_per_search,
+                                                             f"'{term}'", stop=search_done):
+                                if video.id not in self.videos:
+                                    url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
+                                    
+                                    metadata = None
+                                    if self.keep_metadata:
+                                        metadata = VideoMetadata.from_video(video, url, collection_method, collected_at, search_term=term)
+                                    self.add_video(video.id, url, metadata)
+                                    budget.add()
+                                    search_collected += 1
                                 
-                            url = f"https://www.tiktok.com/@{video.author.username}/video/{video.id}"
-                            
-                            if url not in self.collected_urls:
-                                self.collected_urls.add(url)
+                                await self.bucket.acquire()
                                 
-                                # Store metadata
-                                metadata = {
-                                    'url': url,
-                                    'video_id': video.id,
-                                    'username': video.author.username,
-                                    'description': video.as_dict.get('desc', ''),
-                                    'view_count': video.stats.get('playCount', 0),
-                                    'like_count': video.stats.get('diggCount', 0),
-                                    'comment_count': video.stats.get('commentCount', 0),
-                                    'share_count': video.stats.get('shareCount', 0),
-                                    'collection_method': f'search_{term.replace(" ", "_")}',
-                                    'search_term': term,
-                                    'collected_at': datetime.now().isoformat()
-                                }
-                                self.url_metadata.append(metadata)
-                                collected += 1
-                                search_collected += 1
-                            
-                            await asyncio.sleep(0.1)
-                            
-                    except Exception as e:
-                        print(f"   ⚠️ Error with search '{term}': {e}")
-                        continue
-                    
-                    print(f"   ✅ Got {search_collected} URLs from '{term}'")
-                    
-                    # Delay between searches
-                    await asyncio.sleep(random.uniform(3, 6))
+                        except Exception as e:
+                            print(f"   ⚠️ Error with search '{term}': {e}")
+                            return
+                        finally:
+                            budget.release(target_per_search, search_collected)
+                        
+                        print(f"   ✅ Got {search_collected} URLs from '{term}'")
+                        
+                        # Delay before this slot moves on to another search
+                        await asyncio.sleep(random.uniform(3, 6))
+                
+                await asyncio.gather(*(harvest_search(term) for term in search_terms))
                     
         except Exception as e:
             print(f"❌ Error collecting search URLs: {e}")
         
-        print(f"✅ Collected {collected} search URLs from {searches_used} terms")
-        return collected
+        print(f"✅ Collected {budget.collected} search URLs from {searches_used} terms")
+        return budget.collected
 
-    async def collect_user_urls(self, count=200):
+    async def collect_user_urls(self, count=200, api=None):
         """
         Collect URLs from user profiles (find users via search then get their videos)
         """
         print(f"👤 Collecting {count} user video URLs...")
-        collected = 0
+        budget = QueryBudget(count)
         users_processed = 0
         
         try:
-            async with TikTokApi() as api:
-                await api.create_sessions(
-                    ms_tokens=[self.ms_token], 
-                    num_sessions=1, 
-                    sleep_after=1,
-                    suppress_resource_load_types=["image", "media", "font", "stylesheet"]
-                )
-                
+            async with self.api_session(api) as api:
                 # Find users through hashtag searches, then get their videos
                 target_hashtags = random.sample(['fyp', 'viral', 'funny', 'lifestyle', 'food'], 5)
+                sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
                 
-                for hashtag in target_hashtags:
-                    if collected >= count:
-                        break
+                async def harvest_user(username, hashtag):
+                    nonlocal users_processed
+                    async with sem:
+                        target_per_user = budget.claim(10)
+                        if not target_per_user:
+                            return
+                            
+                        users_processed += 1
+                        user_collected = 0
                         
-                    print(f"   🔍 Finding users from #{hashtag}")
-                    users_found = set()
-                    
-                    try:
-                        # Get some videos from hashtag to find users
-                        async for video in api.hashtag(name=hashtag).videos(count=30):
-                            username = video.author.username
-                            if username not in users_found and len(users_found) < 10:
-                                users_found.add(username)
+                        print(f"   👤 Getting videos from @{username} (target: {target_per_user})")
                         
-                        # Now get videos from these users
-                        for username in users_found:
-                            if collected >= count:
-                                break
-                                
-                            users_processed += 1
-                            user_collected = 0
-                            target_per_user = min(10, (count - collected))
-                            
-                            print(f"   👤 Getting videos from @{username} (target: {target_per_user})")
-                            
-                            try:
-                                async for video in api.user(username=username).videos(count=target_per_user):
-                                    if collected >= count or user_collected >= target_per_user:
-                                        break
-                                        
+                        # One timestamp per query, not per video
+                        collected_at = datetime.now().isoformat()
+                        
+                        def user_done():
+                            return budget.done() or user_collected >= target_per_user
+                        
+                        try:
+                            async for video in self.paginate(api.user(username=username).videos, target_per_user,
+                                                             f"@{username}", stop=user_done):
+                                if video.id not in self.videos:
                                     url = f"https://www.tiktok.com/@{username}/video/{video.id}"
                                     
-                                    if url not in self.collected_urls:
-                                        self.collected_urls.add(url)
-                                        
-                                        # Store metadata
-                                        metadata = {
-                                            'url': url,
-                                            'video_id': video.id,
-                                            'username': username,
-                                            'description': video.as_dict.get('desc', ''),
-                                            'view_count': video.stats.get('playCount', 0),
-                                            'like_count': video.stats.get('diggCount', 0),
-                                            'comment_count': video.stats.get('commentCount', 0),
-                                            'share_count': video.stats.get('shareCount', 0),
-                                            'collection_method': f'user_profile',
-                                            'source_hashtag': hashtag,
-                                            'collected_at': datetime.now().isoformat()
-                                        }
-                                        self.url_metadata.append(metadata)
-                                        collected += 1
-                                        user_collected += 1
-                                    
-                                    await asyncio.sleep(0.1)
-                                    
-                            except Exception as e:
-                                print(f"   ⚠️ Error getting videos from @{username}: {e}")
-                                continue
-                            
-                            print(f"   ✅ Got {user_collected} URLs from @{username}")
-                            await asyncio.sleep(random.uniform(2, 4))
+                                    metadata = None
+                                    if self.keep_metadata:
+                                        metadata = VideoMetadata.from_video(video, url, 'user_profile', collected_at,
+                                                                            username=username, source_hashtag=hashtag)
+                                    self.add_video(video.id, url, metadata)
+                                    budget.add()
+                                    user_collected += 1
+                                
+                                await self.bucket.acquire()
+                                
+                        except Exception as e:
+                            print(f"   ⚠️ Error getting videos from @{username}: {e}")
+                            return
+                        finally:
+                            budget.release(target_per_user, user_collected)
+                        
+                        print(f"   ✅ Got {user_collected} URLs from @{username}")
+                        await asyncio.sleep(random.uniform(2, 4))
+                
+                async def harvest_source(hashtag):
+                    # The semaphore only covers the user lookup, since
+                    # harvest_user takes its own slot for each user
+                    async with sem:
+                        if budget.done():
+                            return
                             
-                    except Exception as e:
-                        print(f"   ⚠️ Error processing hashtag #{hashtag}: {e}")
-                        continue
+                        print(f"   🔍 Finding users from #{hashtag}")
+                        users_found = set()
+                        
+                        def source_done():
+                            return budget.done() or len(users_found) >= 10
+                        
+                        try:
+                            # Get some videos from hashtag to find users
+                            async for video in self.paginate(api.hashtag(name=hashtag).videos, 30, f"#{hashtag}",
+                                                             stop=source_done):
+                                username = video.author.username
+                                if username not in users_found and len(users_found) < 10:
+                                    users_found.add(username)
+                        except Exception as e:
+                            print(f"   ⚠️ Error processing hashtag #{hashtag}: {e}")
+                            return
                     
-                    await asyncio.sleep(random.uniform(3, 6))
+                    # Now get videos from these users
+                    await asyncio.gather(*(harvest_user(username, hashtag) for username in users_found))
+                
+                await asyncio.gather(*(harvest_source(hashtag) for hashtag in target_hashtags))
                     
         except Exception as e:
             print(f"❌ Error collecting user URLs: {e}")
         
-        print(f"✅ Collected {collected} user URLs from {users_processed} users")
-        return collected
+        print(f"✅ Collected {budget.collected} user URLs from {users_processed} users")
+        return budget.collected
+
+    def add_video(self, video_id, url, metadata=None):
+        """Keep a new video's URL (and metadata record, if any) and append it to the JSONL sidecar"""
+        self.videos[video_id] = url
+        if metadata is not None:
+            self.url_metadata.append(metadata)
+            self.methods_used.add(metadata.collection_method)
+        
+        if self._jsonl_fh is None:
+            self._jsonl_fh = open(self.jsonl_output, 'ab', buffering=1 << 20)
+        self._jsonl_fh.write(dumps_json(metadata.to_dict() if metadata is not None else {'url': url}) + b'\n')
+        self._unflushed += 1
+        if self._unflushed >= JSONL_FLUSH_EVERY:
+            self._jsonl_fh.flush()
+            self._unflushed = 0
+
+    def close_jsonl(self):
+        """Flush and close the JSONL sidecar"""
+        if self._jsonl_fh is not None:
+            self._jsonl_fh.close()
+            self._jsonl_fh = None
+            self._unflushed = 0
 
     def save_urls(self, output_file="harvested_urls.json"):
         """
         Save collected URLs and metadata to file
         """
-        output_data = {
-            'collection_summary': {
-                'total_urls': len(self.collected_urls),
-                'total_with_metadata': len(self.url_metadata),
-                'collection_date': datetime.now().isoformat(),
-                'methods_used': list(set([item['collection_method'] for item in self.url_metadata]))
-            },
-            'urls': list(self.collected_urls),
-            'url_metadata': self.url_metadata
+        summary = {
+            'total_urls': len(self.videos),
+            'total_with_metadata': len(self.url_metadata),
+            'collection_date': datetime.now().isoformat(),
+            'methods_used': sorted(self.methods_used)
         }
         
+        # Write the document piece by piece through a large buffer rather
+        # than building the whole formatted string in memory first. With
+        # --pretty the layout matches json.dump(..., indent=2).
+        pad = b'  ' if self.pretty else b''
+        
+        def dumps(value, depth):
+            if not self.pretty:
+                return dumps_json(value)
+            return dumps_json_pretty(value).replace(b'\n', b'\n' + pad * depth)
+        
+        def write_array(f, key, values):
+            f.write(pad + key + b': [')
+            empty = True
+            for value in values:
+                f.write((b'\n' if empty else b',\n') + pad * 2 + dumps(value, 2))
+                empty = False
+            f.write(b']' if empty else b'\n' + pad + b']')
+        
         output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(b'{\n' + pad + b'"collection_summary": ' + dumps(summary, 1) + b',\n')
+            write_array(f, b'"urls"', self.videos.values())
+            f.write(b',\n')
+            write_array(f, b'"url_metadata"', (item.to_dict() for item in self.url_metadata))
+            f.write(b'\n}\n')
         
-        print(f"💾 Saved {len(self.collected_urls)} URLs to {output_path}")
         return output_path
 
     def save_urls_txt(self, output_file="harvested_urls.txt"):
@@ -414,13 +645,25 @@ class TikTokURLHarvester:
         Save URLs to simple text file (one URL per line)
         """
         output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for url in sorted(self.collected_urls):
-                f.write(url + '\n')
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            # One write for the whole list instead of one per URL
+            if self.videos:
+                f.write('\n'.join(sorted(self.videos.values())) + '\n')
         
-        print(f"📝 Saved {len(self.collected_urls)} URLs to {output_path}")
         return output_path
 
+    async def save_all(self, json_file="harvested_urls.json", txt_file="harvested_urls.txt"):
+        """Write the JSON and text outputs in worker threads, then report both"""
+        # The writes never block the event loop; printing waits until both are
+        # done so their messages don't interleave
+        json_path, txt_path = await asyncio.gather(
+            asyncio.to_thread(self.save_urls, json_file),
+            asyncio.to_thread(self.save_urls_txt, txt_file)
+        )
+        print(f"💾 Saved {len(self.videos)} URLs to {json_path}")
+        print(f"📝 Saved {len(self.videos)} URLs to {txt_path}")
+        return json_path, txt_path
+
     async def harvest_all(self, trending=200, hashtags=300, searches=200, users=200):
         """
         Run all harvesting methods
@@ -430,17 +673,23 @@ class TikTokURLHarvester:
         
         start_time = time.time()
         
-        # Collect from different sources
-        trending_count = await self.collect_trending_urls(trending)
-        await asyncio.sleep(random.uniform(5, 10))
-        
-        hashtag_count = await self.collect_hashtag_urls(hashtags)
-        await asyncio.sleep(random.uniform(5, 10))
-        
-        search_count = await self.collect_search_urls(searches)
-        await asyncio.sleep(random.uniform(5, 10))
-        
-        user_count = await self.collect_user_urls(users)
+        # Collect from different sources at once over one browser, with a
+        # session per method, all paced by the shared token bucket. They
+        # share self.videos, but the check-and-add has no await in between,
+        # so no lock is needed.
+        trending_count = hashtag_count = search_count = user_count = 0
+        try:
+            async with self.api_session(num_sessions=4) as api:
+                trending_count, hashtag_count, search_count, user_count = await asyncio.gather(
+                    self.collect_trending_urls(trending, api),
+                    self.collect_hashtag_urls(hashtags, api),
+                    self.collect_search_urls(searches, api),
+                    self.collect_user_urls(users, api)
+                )
+        except Exception as e:
+            print(f"❌ Error creating TikTok sessions: {e}")
+        finally:
+            self.close_jsonl()
         
         end_time = time.time()
         duration = end_time - start_time
@@ -452,14 +701,12 @@ class TikTokURLHarvester:
         print(f"   #️⃣ Hashtags: {hashtag_count} URLs")
         print(f"   🔍 Searches: {search_count} URLs")
         print(f"   👤 Users: {user_count} URLs")
-        print(f"   📝 Total unique URLs: {len(self.collected_urls)}")
+        print(f"   📝 Total unique URLs: {len(self.videos)}")
         
-        # Save results
-        json_file = self.save_urls()
-        txt_file = self.save_urls_txt()
+        json_file, txt_file = await self.save_all()
         
         return {
-            'total_urls': len(self.collected_urls),
+            'total_urls': len(self.videos),
             'trending': trending_count,
             'hashtags': hashtag_count,
             'searches': search_count,
@@ -483,6 +730,10 @@ async def main():
                        help="Number of user URLs to collect (default: 200)")
     parser.add_argument("-o", "--output", default="harvested_urls",
                        help="Output filename prefix (default: harvested_urls)")
+    parser.add_argument("--no-metadata", action="store_true",
+                       help="Collect URLs only, without per-video metadata records")
+    parser.add_argument("--pretty", action="store_true",
+                       help="Indent the JSON output for reading (default: compact)")
     
     args = parser.parse_args()
     
@@ -492,7 +743,8 @@ async def main():
         return
     
     # Create harvester
-    harvester = TikTokURLHarvester()
+    harvester = TikTokURLHarvester(jsonl_output=f"{args.output}.jsonl", metadata=not args.no_metadata,
+                                   pretty=args.pretty)
     
     # Run harvesting
     results = await harvester.harvest_all(
@@ -506,8 +758,7 @@ async def main():
     if args.output != "harvested_urls":
         json_file = f"{args.output}.json"
         txt_file = f"{args.output}.txt"
-        harvester.save_urls(json_file)
-        harvester.save_urls_txt(txt_file)
+        await harvester.save_all(json_file, txt_file)
     
     print(f"\n✅ Successfully harvested {results['total_urls']} unique TikTok URLs!")
 
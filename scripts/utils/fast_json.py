@@ -0,0 +1,34 @@
+"""JSON (de)serialization helpers that use orjson when it is installed"""
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_json(record):
+    """Serialize a record as compact UTF-8 JSON (bytes)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record)
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_json_pretty(record):
+    """Serialize a record as 2-space indented UTF-8 JSON (bytes), as used in master files"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data):
+    """Parse JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json_line(record):
+    """Serialize a record as one UTF-8 JSON line (bytes)"""
+    return dumps_json(record) + b'\n'
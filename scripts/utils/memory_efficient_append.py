@@ -3,11 +3,70 @@ import os
 import tempfile
 import shutil
 
+from scripts.utils.fast_json import dumps_json_pretty
+
+
+def find_array_tail(f):
+    """Find where new items go in a JSON array file opened in binary r+ mode.
+
+    Returns (offset just past the last item, or past '[' if the array is
+    empty, is_empty_array), or None if the file doesn't end with a JSON array.
+    """
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    found_end = False
+    while pos > 0:
+        read_size = min(4096, pos)
+        pos -= read_size
+        f.seek(pos)
+        chunk = f.read(read_size)
+        for i in range(len(chunk) - 1, -1, -1):
+            char = chunk[i:i + 1]
+            if char.isspace():
+                continue
+            if not found_end:
+                if char != b']':
+                    return None
+                found_end = True
+            else:
+                return pos + i + 1, char == b'['
+    return None
+
+
+def indent_items(items):
+    """Join pretty-printed items (bytes) as the elements of an indent=2 JSON array"""
+    return b',\n'.join(b'  ' + item.replace(b'\n', b'\n  ') for item in items)
+
+
+def append_items_in_place(items, master_path):
+    """Append pretty-printed items (bytes) after the array's last item; False if not an array
+
+    Only the new bytes are written, and the file keeps its indent=2 layout.
+    """
+    with open(master_path, 'r+b') as f:
+        array_tail = find_array_tail(f)
+        if array_tail is None:
+            return False
+        tail_offset, is_empty = array_tail
+        f.seek(tail_offset)
+        f.write((b'\n' if is_empty else b',\n') + indent_items(items) + b'\n]')
+        f.truncate()
+    return True
+
+
+def _append_in_place(metadata_list, master_path):
+    """Append metadata after the array's last item; False if not an array"""
+    items = [dumps_json_pretty(item) for item in metadata_list]
+    return append_items_in_place(items, master_path)
+
 
 def append_batch_to_master_json_efficient(metadata_list, master_file_path):
     """Memory-efficient version that streams JSON data instead of loading all into memory"""
     master_path = master_file_path
     
+    if not metadata_list:
+        return
+    
     # If file doesn't exist, create it with the new data
     if not os.path.exists(master_path):
         with open(master_path, 'w', encoding='utf-8') as f:
@@ -15,6 +74,11 @@ def append_batch_to_master_json_efficient(metadata_list, master_file_path):
         print(f"📎 Created master file with {len(metadata_list)} videos")
         return
     
+    # Common case: append only the new bytes, without reading the existing items
+    if _append_in_place(metadata_list, master_path):
+        print(f"📎 Appended {len(metadata_list)} videos to master file")
+        return
+    
     # For existing files, use a streaming approach
     temp_fd, temp_path = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(master_path))
     
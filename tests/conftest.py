@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The scripts aren't installed as a package: make the repo root (for
+# scripts.utils) and the script directories importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "scripts", "collection"), os.path.join(ROOT, "scripts", "analysis")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
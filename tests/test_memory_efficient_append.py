@@ -0,0 +1,69 @@
+import json
+
+from scripts.utils.memory_efficient_append import (
+    append_batch_to_master_json_efficient,
+    append_items_in_place,
+    find_array_tail,
+)
+from scripts.utils.fast_json import dumps_json_pretty
+
+
+def write(path, data):
+    path.write_bytes(data.encode('utf-8') if isinstance(data, str) else data)
+    return path
+
+
+def append(path, records):
+    return append_items_in_place([dumps_json_pretty(r) for r in records], path)
+
+
+def test_find_array_tail(tmp_path):
+    master = write(tmp_path / "m.json", '[\n  {"a": 1}\n]  \n')
+    with open(master, 'rb') as f:
+        assert find_array_tail(f) == (len('[\n  {"a": 1}'), False)
+    
+    write(master, '[]')
+    with open(master, 'rb') as f:
+        assert find_array_tail(f) == (1, True)
+    
+    write(master, '{"a": 1}')
+    with open(master, 'rb') as f:
+        assert find_array_tail(f) is None
+
+
+def test_append_to_empty_list(tmp_path):
+    master = write(tmp_path / "m.json", '[]')
+    assert append(master, [{"a": 1}, {"b": 2}])
+    assert master.read_text() == json.dumps([{"a": 1}, {"b": 2}], indent=2)
+
+
+def test_append_keeps_indent_2_layout(tmp_path):
+    existing = [{"a": 1, "tags": ["x", "y"]}]
+    master = write(tmp_path / "m.json", json.dumps(existing, indent=2))
+    assert append(master, [{"b": {"c": [1, 2]}}])
+    assert master.read_text() == json.dumps(existing + [{"b": {"c": [1, 2]}}], indent=2)
+
+
+def test_append_after_trailing_whitespace(tmp_path):
+    master = write(tmp_path / "m.json", json.dumps([{"a": 1}], indent=2) + "\n\n  ")
+    assert append(master, [{"b": 2}])
+    assert json.loads(master.read_text()) == [{"a": 1}, {"b": 2}]
+    assert master.read_text().endswith("\n]")
+
+
+def test_dict_master_is_left_alone(tmp_path):
+    master = write(tmp_path / "m.json", '{"a": 1}')
+    assert not append(master, [{"b": 2}])
+    assert master.read_text() == '{"a": 1}'
+
+
+def test_batch_append_falls_back_for_dict_master(tmp_path):
+    master = write(tmp_path / "m.json", '{"a": 1}')
+    append_batch_to_master_json_efficient([{"b": 2}], str(master))
+    assert json.loads(master.read_text()) == [{"a": 1}, {"b": 2}]
+
+
+def test_batch_append_creates_missing_master(tmp_path):
+    master = tmp_path / "m.json"
+    append_batch_to_master_json_efficient([{"a": 1}], str(master))
+    assert json.loads(master.read_text()) == [{"a": 1}]
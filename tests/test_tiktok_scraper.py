@@ -0,0 +1,125 @@
+import json
+import signal
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import tiktok_scraper as ts
+
+
+# Master journal and compaction
+
+def test_compact_master_appends_journal_in_place(tmp_path):
+    master = tmp_path / "master.json"
+    master.write_text(json.dumps([{"video_id": "1"}], indent=2))
+    
+    assert ts.append_to_master_json({"video_id": "2"}, str(master))
+    assert ts.append_to_master_json({"video_id": "3"}, str(master))
+    assert ts.compact_master(str(master)) == 2
+    
+    expected = [{"video_id": "1"}, {"video_id": "2"}, {"video_id": "3"}]
+    assert master.read_text() == json.dumps(expected, indent=2)
+    assert not (tmp_path / "master.json.jsonl").exists()
+
+
+def test_compact_master_creates_master(tmp_path):
+    master = tmp_path / "master.json"
+    ts.append_to_master_json({"video_id": "1"}, str(master))
+    assert ts.compact_master(str(master)) == 1
+    assert json.loads(master.read_text()) == [{"video_id": "1"}]
+
+
+def test_compact_master_quarantines_torn_lines(tmp_path):
+    master = tmp_path / "master.json"
+    journal = tmp_path / "master.json.jsonl"
+    # A writer killed mid-line leaves a partial record with no newline
+    journal.write_bytes(b'{"video_id": "1"}\n{"video_id": "2", "ti')
+    
+    # The next append starts a fresh line instead of joining the torn one
+    ts.append_to_master_json({"video_id": "3"}, str(master))
+    assert ts.compact_master(str(master)) == 2
+    
+    assert json.loads(master.read_text()) == [{"video_id": "1"}, {"video_id": "3"}]
+    assert (tmp_path / "master.json.jsonl.bad").read_bytes() == b'{"video_id": "2", "ti\n'
+
+
+def test_compact_master_without_journal(tmp_path):
+    assert ts.compact_master(str(tmp_path / "master.json")) == 0
+
+
+# Processed-URL journal
+
+def test_compact_processed_urls(tmp_path):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("https://a\nhttps://b\n-https://old\nhttps://c\n")
+    
+    ts.mark_url_processed(str(url_file), "https://a")
+    ts.mark_url_processed(str(url_file), "https://c")
+    ts.compact_processed_urls(str(url_file))
+    
+    assert url_file.read_text() == "-https://a\nhttps://b\n-https://old\n-https://c\n"
+    assert not (tmp_path / "urls.txt.processed").exists()
+
+
+def test_mark_url_processed_buffers_until_flush(tmp_path):
+    url_file = str(tmp_path / "urls.txt")
+    journal = tmp_path / "urls.txt.processed"
+    
+    ts.mark_url_processed(url_file, "https://a")
+    assert not journal.exists()
+    
+    # Videos already recorded in master are written straight through
+    ts.mark_url_processed(url_file, "https://b", flush=True)
+    assert journal.read_text() == "https://a\nhttps://b\n"
+    assert ts.load_processed_journal(url_file) == {"https://a", "https://b"}
+
+
+# Per-video worker deadline
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    """Run worker_process in this process with a short deadline"""
+    master = tmp_path / "master.json"
+    monkeypatch.setattr(ts, "WORKER_TIMEOUT", 0.2)
+    monkeypatch.setattr(ts, "_worker_cfg", SimpleNamespace(
+        output_dir=str(tmp_path), quality="best", audio_only=False,
+        append_file=str(master), use_whisper=False))
+    
+    def run(download_seconds):
+        def fake_download(url, *args, **kwargs):
+            # Short sleeps, like a download's read loop, so the watchdog's
+            # interrupt_main() is seen between them
+            deadline = time.monotonic() + download_seconds
+            while time.monotonic() < deadline:
+                time.sleep(0.01)
+            return {'success': True, 'folder': str(tmp_path), 'metadata': {'url': url}, 'url': url}
+        monkeypatch.setattr(ts, "download_single_video", fake_download)
+        return ts.worker_process("https://a")
+    
+    run.journal = tmp_path / "master.json.jsonl"
+    return run
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs setitimer")
+def test_worker_timeout_with_timer(worker):
+    result = worker(2)
+    assert not result['success']
+    assert "exceeded" in result['error']
+    assert not worker.journal.exists()
+
+
+def test_worker_timeout_with_watchdog(worker, monkeypatch):
+    monkeypatch.delattr(ts.signal, "setitimer", raising=False)
+    result = worker(2)
+    assert not result['success']
+    assert "exceeded" in result['error']
+    assert not worker.journal.exists()
+
+
+def test_worker_appends_within_deadline(worker):
+    result = worker(0)
+    assert result['success'] and result['appended']
+    assert json.loads(worker.journal.read_text()) == {"url": "https://a"}
+    # The deadline is disarmed once the download is done
+    time.sleep(0.3)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("TikTokApi")
+import url_harvester as uh
+
+
+class HTTPError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+@pytest.mark.parametrize("error, expected", [
+    (Exception("HTTP 429"), True),
+    (Exception("status code: 429"), True),
+    (Exception("429 Too Many Requests"), True),
+    (Exception("rate limited, try later"), True),
+    (HTTPError("request failed", status=429), True),
+    # Video ids often contain 429; that alone isn't throttling
+    (Exception("failed to fetch video 7234298765429123456"), False),
+    (HTTPError("not found", status=404), False),
+])
+def test_is_rate_limit_error(error, expected):
+    assert uh.is_rate_limit_error(error) is expected
+
+
+def test_token_bucket_paces_after_burst():
+    async def take(bucket, n):
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+    
+    bucket = uh.AsyncTokenBucket(rate=50, capacity=5)
+    # The burst is free; each token after it waits about 1/rate
+    assert asyncio.run(take(bucket, 5)) < 0.05
+    assert asyncio.run(take(bucket, 5)) >= 0.07
+
+
+def test_token_bucket_penalize_and_recover(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(uh.time, "monotonic", lambda: now[0])
+    bucket = uh.AsyncTokenBucket(rate=40, capacity=10, min_rate=1)
+    
+    bucket.penalize()
+    assert bucket.rate == 20 and bucket.tokens == 0
+    for _ in range(10):
+        bucket.penalize()
+    assert bucket.rate == 1
+    
+    # Back to the full rate after RATE_RECOVERY_SECONDS without errors
+    now[0] += uh.RATE_RECOVERY_SECONDS
+    bucket._refill()
+    assert bucket.rate == 40
+
+
+def test_query_budget_splits_remaining_count():
+    budget = uh.QueryBudget(5)
+    first = budget.claim(20)
+    assert first == 5
+    assert budget.claim(20) == 0
+    
+    for _ in range(3):
+        budget.add()
+    budget.release(first, 3)
+    # The unfilled part of the first claim is free for the next query
+    assert budget.claim(20) == 2
+    assert not budget.done()
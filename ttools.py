@@ -5,46 +5,57 @@ import subprocess
 import sys
 import importlib.util
 
+# Descriptions for known scripts
+SCRIPT_DESCRIPTIONS = {
+    # Analysis scripts
+    "comment_extractor.py": "Extract comments from TikTok videos and update master.json",
+    "count.py": "Count posts and comments from master JSON files",
+    "count_master.py": "Analyze entries in master2.json with error recovery",
+    
+    # Cleanup scripts
+    "sanitize_json.py": "Extract videos with transcriptions > 40 chars",
+    "fix_json.py": "Fix corrupted JSON files by extracting valid objects",
+    "remove_duplicates.py": "Remove duplicate URLs keeping most complete data",
+    "clean_no_transcription.py": "Remove entries without transcriptions",
+    "deduplicate.py": "Remove duplicate URLs from text files",
+    
+    # Collection scripts
+    "browser_harvester.py": "Harvest URLs from existing Firefox browser",
+    "tiktok_url_collector.py": "Collect URLs with stealth browser mode",
+    "url_harvester.py": "Harvest URLs from trending/hashtags/users/searches",
+    "update_comments_v2.py": "Update master2.json with video comments",
+    "master_download_and_comment.py": "Download videos and extract comments",
+    "tiktok_scraper.py": "Multi-process downloader with resume capability",
+    "tiktok_downloader.py": "Simple video downloader using yt-dlp",
+    
+    # Utils scripts
+    "connect_existing_firefox.py": "Connect to Firefox for remote debugging",
+    "memory_efficient_append.py": "Stream append JSON without loading all data",
+    "process_single_video.py": "Extract comments from a single video"
+}
+
 def get_script_info(script_path):
     """Returns description for known scripts."""
-    script_descriptions = {
-        # Analysis scripts
-        "comment_extractor.py": "Extract comments from TikTok videos and update master.json",
-        "count.py": "Count posts and comments from master JSON files",
-        "count_master.py": "Analyze entries in master2.json with error recovery",
-        
-        # Cleanup scripts
-        "sanitize_json.py": "Extract videos with transcriptions > 40 chars",
-        "fix_json.py": "Fix corrupted JSON files by extracting valid objects",
-        "remove_duplicates.py": "Remove duplicate URLs keeping most complete data",
-        "clean_no_transcription.py": "Remove entries without transcriptions",
-        "deduplicate.py": "Remove duplicate URLs from text files",
-        
-        # Collection scripts
-        "browser_harvester.py": "Harvest URLs from existing Firefox browser",
-        "tiktok_url_collector.py": "Collect URLs with stealth browser mode",
-        "url_harvester.py": "Harvest URLs from trending/hashtags/users/searches",
-        "update_comments_v2.py": "Update master2.json with video comments",
-        "master_download_and_comment.py": "Download videos and extract comments",
-        "tiktok_scraper.py": "Multi-process downloader with resume capability",
-        "tiktok_downloader.py": "Simple video downloader using yt-dlp",
-        
-        # Utils scripts
-        "connect_existing_firefox.py": "Connect to Firefox for remote debugging",
-        "memory_efficient_append.py": "Stream append JSON without loading all data",
-        "process_single_video.py": "Extract comments from a single video"
-    }
-    
     script_name = os.path.basename(script_path)
-    return script_descriptions.get(script_name, "No description available.")
+    return SCRIPT_DESCRIPTIONS.get(script_name, "No description available.")
 
 def find_scripts(directory="scripts"):
     """Finds all Python scripts in the given directory and its subdirectories, ignoring __init__.py."""
     scripts = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".py") and not file.startswith("__"):
-                scripts.append(os.path.join(root, file))
+    if not os.path.isdir(directory):
+        return scripts
+    stack = [directory]
+    while stack:
+        subdirs = []
+        # DirEntry caches the file type from readdir, so no stat() per entry
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".py") and not entry.name.startswith("__"):
+                    scripts.append(entry.path)
+        # Visit subdirectories in listing order, as os.walk did
+        stack.extend(reversed(subdirs))
     return scripts
 
 def main():